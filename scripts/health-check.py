@@ -4,15 +4,25 @@ DataFlux Health Check System
 Comprehensive health monitoring for all DataFlux services
 """
 
+import argparse
 import asyncio
 import aiohttp
 import json
+import sys
 import time
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
+from collections import Counter
+from typing import Dict, List, Any, Optional, Tuple
+from dataclasses import dataclass, field
 from datetime import datetime
 
-@dataclass
+try:
+    import httpx
+    import h2  # noqa: F401 - required by httpx for http2=True
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+@dataclass(slots=True, frozen=True)
 class HealthCheckResult:
     """Health check result"""
     service: str
@@ -21,11 +31,68 @@ class HealthCheckResult:
     timestamp: datetime
     details: Dict[str, Any]
     error: Optional[str] = None
+    timestamp_iso: str = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Format once at construction so reports don't re-run isoformat per result
+        object.__setattr__(self, "timestamp_iso", self.timestamp.isoformat())
+
+@dataclass(slots=True, frozen=True)
+class ServiceConfig:
+    """Pre-resolved health check target"""
+    name: str
+    url: str
+    timeout: float
+    expected_status: int
+    method: str = "GET"
+
+def _aggregate(results: List[HealthCheckResult]) -> Tuple[int, Dict[str, int], Dict[str, List[HealthCheckResult]], float]:
+    """Count, bucket and sum response times of results"""
+    counts = Counter(r.status for r in results)
+    by_status: Dict[str, List[HealthCheckResult]] = {"healthy": [], "unhealthy": [], "degraded": []}
+    total_response_time = 0.0
+    
+    for r in results:
+        total_response_time += r.response_time
+        bucket = by_status.get(r.status)
+        if bucket is not None:
+            bucket.append(r)
+    
+    return len(results), counts, by_status, total_response_time
 
 class DataFluxHealthChecker:
     """Comprehensive health checker for DataFlux services"""
     
-    def __init__(self):
+    def __init__(self, max_concurrency: int = 10, cache_ttl: float = 5.0,
+                 max_cache_ttl: float = 30.0, failure_ttl: float = 0.5,
+                 failure_threshold: int = 3, circuit_open_seconds: float = 30.0,
+                 initial_delay: float = 0.1, backoff: float = 1.5, max_delay: float = 2.0,
+                 backend: str = "aiohttp", parse_details: bool = False):
+        self.max_concurrency = max_concurrency
+        self.parse_details = parse_details
+        self._sem = asyncio.Semaphore(max_concurrency)
+        self._session: Optional[aiohttp.ClientSession] = None
+        
+        # httpx multiplexes probes over HTTP/2 where the endpoint negotiates it;
+        # fall back to aiohttp when httpx or h2 is not installed
+        self.backend = "httpx" if backend == "httpx" and HTTPX_AVAILABLE else "aiohttp"
+        self._client: Optional["httpx.AsyncClient"] = None
+        
+        # Result cache with adaptive TTL; doubles as a circuit breaker
+        self.cache_ttl = cache_ttl
+        self.max_cache_ttl = max_cache_ttl
+        self.failure_ttl = failure_ttl
+        self.failure_threshold = failure_threshold
+        self.circuit_open_seconds = circuit_open_seconds
+        self._cache: Dict[str, Tuple[float, HealthCheckResult]] = {}
+        self._ttl: Dict[str, float] = {}
+        self._failures: Dict[str, int] = {}
+        self._circuit_open_until: Dict[str, float] = {}
+        
+        # Startup probe backoff
+        self.initial_delay = initial_delay
+        self.backoff = backoff
+        self.max_delay = max_delay
         self.services = {
             "ingestion-service": {
                 "url": "http://localhost:8002/health",
@@ -50,7 +117,8 @@ class DataFluxHealthChecker:
             "web-ui": {
                 "url": "http://localhost:3000",
                 "timeout": 5,
-                "expected_status": 200
+                "expected_status": 200,
+                "method": "HEAD"
             },
             "api-gateway": {
                 "url": "http://localhost:2013/health",
@@ -60,22 +128,26 @@ class DataFluxHealthChecker:
             "postgres": {
                 "url": "http://localhost:2001",
                 "timeout": 5,
-                "expected_status": 200
+                "expected_status": 200,
+                "method": "HEAD"
             },
             "redis": {
                 "url": "http://localhost:2002",
                 "timeout": 5,
-                "expected_status": 200
+                "expected_status": 200,
+                "method": "HEAD"
             },
             "kafka": {
                 "url": "http://localhost:2009",
                 "timeout": 5,
-                "expected_status": 200
+                "expected_status": 200,
+                "method": "HEAD"
             },
             "minio": {
                 "url": "http://localhost:2003/minio/health/live",
                 "timeout": 5,
-                "expected_status": 200
+                "expected_status": 200,
+                "method": "HEAD"
             },
             "weaviate": {
                 "url": "http://localhost:2005/v1/meta",
@@ -85,17 +157,20 @@ class DataFluxHealthChecker:
             "neo4j": {
                 "url": "http://localhost:2007/db/data/",
                 "timeout": 5,
-                "expected_status": 200
+                "expected_status": 200,
+                "method": "HEAD"
             },
             "clickhouse": {
                 "url": "http://localhost:2011/ping",
                 "timeout": 5,
-                "expected_status": 200
+                "expected_status": 200,
+                "method": "HEAD"
             },
             "prometheus": {
                 "url": "http://localhost:2020/-/healthy",
                 "timeout": 5,
-                "expected_status": 200
+                "expected_status": 200,
+                "method": "HEAD"
             },
             "grafana": {
                 "url": "http://localhost:2021/api/health",
@@ -103,44 +178,155 @@ class DataFluxHealthChecker:
                 "expected_status": 200
             }
         }
+        self._svc_list: List[ServiceConfig] = [
+            ServiceConfig(
+                name,
+                cfg["url"],
+                cfg["timeout"],
+                cfg["expected_status"],
+                cfg.get("method", "GET")
+            )
+            for name, cfg in self.services.items()
+        ]
+    
+    async def __aenter__(self) -> "DataFluxHealthChecker":
+        if self.backend == "httpx":
+            self._get_client()
+        else:
+            self._get_session()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared session, creating it on first use"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=32,
+                limit_per_host=4,
+                ttl_dns_cache=300,
+                keepalive_timeout=30
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+    
+    def _get_client(self) -> "httpx.AsyncClient":
+        """Return the shared HTTP/2 client, creating it on first use"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=True,
+                timeout=httpx.Timeout(5.0),
+                limits=httpx.Limits(max_connections=32, max_keepalive_connections=16)
+            )
+        return self._client
+    
+    async def close(self):
+        """Close the shared session and release pooled connections"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        if self._client is not None:
+            await self._client.aclose()
+        self._client = None
+    
+    async def check_service_health(self, svc: ServiceConfig,
+                                   force_refresh: bool = False) -> HealthCheckResult:
+        """Check health of a single service, bounded by max_concurrency"""
+        service_name = svc.name
+        if not force_refresh:
+            now = time.time()
+            cached = self._cache.get(service_name)
+            if cached and now - cached[0] < self._ttl.get(service_name, self.cache_ttl):
+                return cached[1]
+            
+            if self._circuit_open_until.get(service_name, 0) > now:
+                return HealthCheckResult(
+                    service=service_name,
+                    status="unhealthy",
+                    response_time=0,
+                    timestamp=datetime.now(),
+                    details={},
+                    error=f"Circuit open after {self._failures[service_name]} consecutive failures"
+                )
+        
+        async with self._sem:
+            result = await self._probe_service(svc)
+        
+        self._record_result(service_name, result)
+        return result
+    
+    def _record_result(self, service_name: str, result: HealthCheckResult):
+        """Cache a result and adapt the service's TTL and circuit state"""
+        now = time.time()
+        
+        if result.status == "healthy":
+            # Extend the TTL on success so stable services are polled less often
+            self._failures[service_name] = 0
+            self._circuit_open_until.pop(service_name, None)
+            self._ttl[service_name] = min(
+                self._ttl.get(service_name, self.cache_ttl) * 2,
+                self.max_cache_ttl
+            )
+        else:
+            # Re-check failing services soon, but stop hammering them after repeated failures
+            failures = self._failures.get(service_name, 0) + 1
+            self._failures[service_name] = failures
+            self._ttl[service_name] = min(self.cache_ttl, self.failure_ttl)
+            if failures >= self.failure_threshold:
+                self._circuit_open_until[service_name] = now + self.circuit_open_seconds
+        
+        self._cache[service_name] = (now, result)
+    
+    def _wants_details(self, svc: ServiceConfig) -> bool:
+        """Whether the response body should be parsed into result details"""
+        return self.parse_details and svc.method != "HEAD"
     
-    async def check_service_health(self, service_name: str, config: Dict[str, Any]) -> HealthCheckResult:
-        """Check health of a single service"""
+    async def _probe_service(self, svc: ServiceConfig) -> HealthCheckResult:
+        """Issue the health request for a single service"""
+        if self.backend == "httpx":
+            return await self._probe_service_httpx(svc)
+        
         start_time = time.time()
+        session = self._get_session()
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    config["url"],
-                    timeout=aiohttp.ClientTimeout(total=config["timeout"])
-                ) as response:
-                    response_time = time.time() - start_time
-                    
-                    if response.status == config["expected_status"]:
-                        status = "healthy"
-                        error = None
-                    else:
-                        status = "unhealthy"
-                        error = f"Unexpected status code: {response.status}"
-                    
-                    # Try to get response details
+            async with session.request(
+                svc.method,
+                svc.url,
+                timeout=aiohttp.ClientTimeout(total=svc.timeout)
+            ) as response:
+                response_time = time.time() - start_time
+                
+                if response.status == svc.expected_status:
+                    status = "healthy"
+                    error = None
+                else:
+                    status = "unhealthy"
+                    error = f"Unexpected status code: {response.status}"
+                
+                # Only decode bodies that declare JSON and were requested; release the rest unread
+                if self._wants_details(svc) and response.content_type in ("application/json", "text/json"):
                     try:
-                        details = await response.json()
-                    except:
+                        details = await response.json(content_type=None)
+                    except (aiohttp.ContentTypeError, json.JSONDecodeError, UnicodeDecodeError):
                         details = {"status_code": response.status}
-                    
-                    return HealthCheckResult(
-                        service=service_name,
-                        status=status,
-                        response_time=response_time,
-                        timestamp=datetime.now(),
-                        details=details,
-                        error=error
-                    )
+                else:
+                    response.release()
+                    details = {"status_code": response.status}
+                
+                return HealthCheckResult(
+                    service=svc.name,
+                    status=status,
+                    response_time=response_time,
+                    timestamp=datetime.now(),
+                    details=details,
+                    error=error
+                )
         
         except asyncio.TimeoutError:
             return HealthCheckResult(
-                service=service_name,
+                service=svc.name,
                 status="unhealthy",
                 response_time=time.time() - start_time,
                 timestamp=datetime.now(),
@@ -148,9 +334,12 @@ class DataFluxHealthChecker:
                 error="Request timeout"
             )
         
-        except Exception as e:
+        except asyncio.CancelledError:
+            raise
+        
+        except (aiohttp.ClientError, OSError) as e:
             return HealthCheckResult(
-                service=service_name,
+                service=svc.name,
                 status="unhealthy",
                 response_time=time.time() - start_time,
                 timestamp=datetime.now(),
@@ -158,25 +347,81 @@ class DataFluxHealthChecker:
                 error=str(e)
             )
     
-    async def check_all_services(self) -> List[HealthCheckResult]:
-        """Check health of all services"""
-        tasks = []
+    async def _probe_service_httpx(self, svc: ServiceConfig) -> HealthCheckResult:
+        """Issue the health request for a single service over the httpx client"""
+        start_time = time.time()
+        client = self._get_client()
+        
+        try:
+            async with client.stream(svc.method, svc.url, timeout=svc.timeout) as response:
+                response_time = time.time() - start_time
+            
+                if response.status_code == svc.expected_status:
+                    status = "healthy"
+                    error = None
+                else:
+                    status = "unhealthy"
+                    error = f"Unexpected status code: {response.status_code}"
+            
+                # Only download and decode the body when details were requested
+                content_type = response.headers.get("content-type", "").split(";")[0].strip()
+                if self._wants_details(svc) and content_type in ("application/json", "text/json"):
+                    try:
+                        await response.aread()
+                        details = response.json()
+                    except (json.JSONDecodeError, UnicodeDecodeError):
+                        details = {"status_code": response.status_code}
+                else:
+                    details = {"status_code": response.status_code}
+            
+                return HealthCheckResult(
+                    service=svc.name,
+                    status=status,
+                    response_time=response_time,
+                    timestamp=datetime.now(),
+                    details=details,
+                    error=error
+                )
+        
+        except httpx.TimeoutException:
+            return HealthCheckResult(
+                service=svc.name,
+                status="unhealthy",
+                response_time=time.time() - start_time,
+                timestamp=datetime.now(),
+                details={},
+                error="Request timeout"
+            )
         
-        for service_name, config in self.services.items():
-            task = self.check_service_health(service_name, config)
-            tasks.append(task)
+        except asyncio.CancelledError:
+            raise
         
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        except (httpx.HTTPError, OSError) as e:
+            return HealthCheckResult(
+                service=svc.name,
+                status="unhealthy",
+                response_time=time.time() - start_time,
+                timestamp=datetime.now(),
+                details={},
+                error=str(e)
+            )
+    
+    async def check_all_services(self, force_refresh: bool = False) -> List[HealthCheckResult]:
+        """Check health of all services"""
+        results = await asyncio.gather(
+            *[self.check_service_health(svc, force_refresh) for svc in self._svc_list],
+            return_exceptions=True
+        )
         
         # Filter out exceptions and convert to HealthCheckResult
         health_results = []
-        for result in results:
+        for svc, result in zip(self._svc_list, results):
             if isinstance(result, HealthCheckResult):
                 health_results.append(result)
             else:
-                # Handle exceptions
+                # Handle unexpected exceptions that escaped the probe
                 health_results.append(HealthCheckResult(
-                    service="unknown",
+                    service=svc.name,
                     status="unhealthy",
                     response_time=0,
                     timestamp=datetime.now(),
@@ -186,22 +431,44 @@ class DataFluxHealthChecker:
         
         return health_results
     
+    async def wait_for_services(self, service_names: Optional[List[str]] = None,
+                                max_wait: float = 60.0) -> bool:
+        """Wait until services report healthy, probing in parallel with exponential backoff"""
+        pending = {
+            svc.name: svc for svc in self._svc_list
+            if service_names is None or svc.name in service_names
+        }
+        deadline = time.time() + max_wait
+        delay = self.initial_delay
+        
+        while True:
+            results = await asyncio.gather(*[
+                self.check_service_health(svc, force_refresh=True)
+                for svc in pending.values()
+            ])
+            for result in results:
+                if result.status == "healthy":
+                    pending.pop(result.service, None)
+            
+            if not pending:
+                return True
+            
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return False
+            
+            await asyncio.sleep(min(delay, remaining))
+            delay = min(delay * self.backoff, self.max_delay)
+    
     def generate_health_report(self, results: List[HealthCheckResult]) -> Dict[str, Any]:
         """Generate a comprehensive health report"""
-        total_services = len(results)
-        healthy_services = len([r for r in results if r.status == "healthy"])
-        unhealthy_services = len([r for r in results if r.status == "unhealthy"])
-        degraded_services = len([r for r in results if r.status == "degraded"])
+        total_services, counts, by_status, total_response_time = _aggregate(results)
+        healthy_services = counts["healthy"]
+        unhealthy_services = counts["unhealthy"]
+        degraded_services = counts["degraded"]
         
         # Calculate average response time
-        avg_response_time = sum(r.response_time for r in results) / total_services if total_services > 0 else 0
-        
-        # Group services by status
-        by_status = {
-            "healthy": [r for r in results if r.status == "healthy"],
-            "unhealthy": [r for r in results if r.status == "unhealthy"],
-            "degraded": [r for r in results if r.status == "degraded"]
-        }
+        avg_response_time = total_response_time / total_services if total_services > 0 else 0
         
         # Overall system health
         if unhealthy_services == 0 and degraded_services == 0:
@@ -228,7 +495,7 @@ class DataFluxHealthChecker:
                     "service": r.service,
                     "status": r.status,
                     "response_time": r.response_time,
-                    "timestamp": r.timestamp.isoformat(),
+                    "timestamp": r.timestamp_iso,
                     "details": r.details,
                     "error": r.error
                 }
@@ -238,8 +505,10 @@ class DataFluxHealthChecker:
     
     def print_health_report(self, report: Dict[str, Any]):
         """Print a formatted health report"""
-        print("🏥 DataFlux Health Check Report")
-        print("=" * 50)
+        lines: List[str] = [
+            "🏥 DataFlux Health Check Report",
+            "=" * 50
+        ]
         
         # Overall status
         status_emoji = {
@@ -248,35 +517,39 @@ class DataFluxHealthChecker:
             "unhealthy": "❌"
         }
         
-        print(f"Overall Status: {status_emoji.get(report['overall_status'], '❓')} {report['overall_status'].upper()}")
-        print(f"Timestamp: {report['timestamp']}")
-        print()
+        lines.append(f"Overall Status: {status_emoji.get(report['overall_status'], '❓')} {report['overall_status'].upper()}")
+        lines.append(f"Timestamp: {report['timestamp']}")
+        lines.append("")
         
         # Summary
         summary = report["summary"]
-        print("📊 Summary:")
-        print(f"  Total Services: {summary['total_services']}")
-        print(f"  Healthy: {summary['healthy_services']} ({summary['health_percentage']:.1f}%)")
-        print(f"  Unhealthy: {summary['unhealthy_services']}")
-        print(f"  Degraded: {summary['degraded_services']}")
-        print(f"  Avg Response Time: {summary['average_response_time']:.3f}s")
-        print()
+        lines.append("📊 Summary:")
+        lines.append(f"  Total Services: {summary['total_services']}")
+        lines.append(f"  Healthy: {summary['healthy_services']} ({summary['health_percentage']:.1f}%)")
+        lines.append(f"  Unhealthy: {summary['unhealthy_services']}")
+        lines.append(f"  Degraded: {summary['degraded_services']}")
+        lines.append(f"  Avg Response Time: {summary['average_response_time']:.3f}s")
+        lines.append("")
         
         # Services by status
         for status, services in report["services_by_status"].items():
             if services:
-                print(f"{status_emoji.get(status, '❓')} {status.upper()} Services:")
+                lines.append(f"{status_emoji.get(status, '❓')} {status.upper()} Services:")
                 for service in services:
-                    print(f"  - {service.service}: {service.response_time:.3f}s")
+                    lines.append(f"  - {service.service}: {service.response_time:.3f}s")
                     if service.error:
-                        print(f"    Error: {service.error}")
-                print()
+                        lines.append(f"    Error: {service.error}")
+                lines.append("")
+        
+        # Emit the whole report with a single write
+        sys.stdout.write("\n".join(lines) + "\n")
 
 # Mock implementation for testing
-class MockDataFluxHealthChecker:
+class MockDataFluxHealthChecker(DataFluxHealthChecker):
     """Mock health checker for testing"""
     
     def __init__(self):
+        super().__init__()
         self.mock_results = [
             HealthCheckResult(
                 service="ingestion-service",
@@ -309,96 +582,10 @@ class MockDataFluxHealthChecker:
             )
         ]
     
-    async def check_all_services(self) -> List[HealthCheckResult]:
+    async def check_all_services(self, force_refresh: bool = False) -> List[HealthCheckResult]:
         """Mock check all services"""
         await asyncio.sleep(0.1)  # Simulate async operation
         return self.mock_results
-    
-    def generate_health_report(self, results: List[HealthCheckResult]) -> Dict[str, Any]:
-        """Generate a comprehensive health report"""
-        total_services = len(results)
-        healthy_services = len([r for r in results if r.status == "healthy"])
-        unhealthy_services = len([r for r in results if r.status == "unhealthy"])
-        degraded_services = len([r for r in results if r.status == "degraded"])
-        
-        # Calculate average response time
-        avg_response_time = sum(r.response_time for r in results) / total_services if total_services > 0 else 0
-        
-        # Group services by status
-        by_status = {
-            "healthy": [r for r in results if r.status == "healthy"],
-            "unhealthy": [r for r in results if r.status == "unhealthy"],
-            "degraded": [r for r in results if r.status == "degraded"]
-        }
-        
-        # Overall system health
-        if unhealthy_services == 0 and degraded_services == 0:
-            overall_status = "healthy"
-        elif unhealthy_services == 0:
-            overall_status = "degraded"
-        else:
-            overall_status = "unhealthy"
-        
-        return {
-            "overall_status": overall_status,
-            "timestamp": datetime.now().isoformat(),
-            "summary": {
-                "total_services": total_services,
-                "healthy_services": healthy_services,
-                "unhealthy_services": unhealthy_services,
-                "degraded_services": degraded_services,
-                "health_percentage": (healthy_services / total_services) * 100 if total_services > 0 else 0,
-                "average_response_time": avg_response_time
-            },
-            "services_by_status": by_status,
-            "detailed_results": [
-                {
-                    "service": r.service,
-                    "status": r.status,
-                    "response_time": r.response_time,
-                    "timestamp": r.timestamp.isoformat(),
-                    "details": r.details,
-                    "error": r.error
-                }
-                for r in results
-            ]
-        }
-    
-    def print_health_report(self, report: Dict[str, Any]):
-        """Print a formatted health report"""
-        print("🏥 DataFlux Health Check Report")
-        print("=" * 50)
-        
-        # Overall status
-        status_emoji = {
-            "healthy": "✅",
-            "degraded": "⚠️",
-            "unhealthy": "❌"
-        }
-        
-        print(f"Overall Status: {status_emoji.get(report['overall_status'], '❓')} {report['overall_status'].upper()}")
-        print(f"Timestamp: {report['timestamp']}")
-        print()
-        
-        # Summary
-        summary = report["summary"]
-        print("📊 Summary:")
-        print(f"  Total Services: {summary['total_services']}")
-        print(f"  Healthy: {summary['healthy_services']} ({summary['health_percentage']:.1f}%)")
-        print(f"  Unhealthy: {summary['unhealthy_services']}")
-        print(f"  Degraded: {summary['degraded_services']}")
-        print(f"  Avg Response Time: {summary['average_response_time']:.3f}s")
-        print()
-        
-        # Services by status
-        for status, services in report["services_by_status"].items():
-            if services:
-                print(f"{status_emoji.get(status, '❓')} {status.upper()} Services:")
-                for service in services:
-                    print(f"  - {service.service}: {service.response_time:.3f}s")
-                    if service.error:
-                        print(f"    Error: {service.error}")
-                print()
 
 # Test function
 async def test_health_checker():
@@ -407,18 +594,49 @@ async def test_health_checker():
     print("=" * 40)
     
     # Use mock implementation for testing
-    checker = MockDataFluxHealthChecker()
-    
-    # Check all services
-    results = await checker.check_all_services()
-    
-    # Generate report
-    report = checker.generate_health_report(results)
-    
-    # Print report
-    checker.print_health_report(report)
+    async with MockDataFluxHealthChecker() as checker:
+        # Check all services
+        results = await checker.check_all_services()
+        
+        # Generate report
+        report = checker.generate_health_report(results)
+        
+        # Print report
+        checker.print_health_report(report)
     
     print("\n🎉 Health checker test completed!")
 
+async def wait_until_healthy(service_names: List[str], max_wait: float) -> bool:
+    """Block until the named services (all when empty) report healthy"""
+    print(f"⏳ Waiting up to {max_wait:g}s for {', '.join(service_names) or 'all services'}...")
+    async with DataFluxHealthChecker() as checker:
+        unknown = set(service_names) - set(checker.services)
+        if unknown:
+            print(f"❌ Unknown services: {', '.join(sorted(unknown))}")
+            return False
+        ready = await checker.wait_for_services(service_names or None, max_wait=max_wait)
+    
+    print("✅ Services are healthy" if ready else "❌ Services not healthy before timeout")
+    return ready
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="DataFlux health checks")
+    parser.add_argument("--wait", type=float, metavar="SECONDS",
+                        help="wait up to SECONDS for services to become healthy; exit 1 on timeout")
+    parser.add_argument("services", nargs="*",
+                        help="services to wait for with --wait (default: all)")
+    args = parser.parse_args()
+    if args.services and args.wait is None:
+        parser.error("service names are only used with --wait")
+    
+    # uvloop is optional; it lowers per-await overhead for the probe fan-out
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
+    if args.wait is not None:
+        sys.exit(0 if asyncio.run(wait_until_healthy(args.services, args.wait)) else 1)
+    
     asyncio.run(test_health_checker())
@@ -6,39 +6,125 @@ Creates the graph database schema for relationships and similarity edges
 
 import json
 import requests
+from requests.adapters import HTTPAdapter
 import time
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
+
+try:
+    from neo4j import GraphDatabase
+    from neo4j.exceptions import DriverError, Neo4jError, ServiceUnavailable
+    NEO4J_DRIVER_AVAILABLE = True
+except ImportError:
+    NEO4J_DRIVER_AVAILABLE = False
 
 class Neo4jSchemaManager:
     def __init__(self, neo4j_url: str = "http://localhost:2007", 
-                 username: str = "neo4j", password: str = "dataflux_pass"):
+                 username: str = "neo4j", password: str = "dataflux_pass",
+                 bolt_url: Optional[str] = "bolt://localhost:2008",
+                 initial_delay: float = 0.1, backoff: float = 1.5, max_delay: float = 2.0,
+                 bolt_grace: float = 10.0):
         self.neo4j_url = neo4j_url
+        self.bolt_url = bolt_url
+        self.initial_delay = initial_delay
+        self.backoff = backoff
+        self.max_delay = max_delay
+        # Seconds Bolt may lag behind a ready REST endpoint before it is given up
+        self.bolt_grace = bolt_grace
         self.username = username
         self.password = password
         self.auth = (username, password)
         
+        # One pooled session keeps the TCP connection alive across Cypher calls
+        self.session = requests.Session()
+        self.session.auth = self.auth
+        self.session.headers.update({"Content-Type": "application/json"})
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        
+        # Prefer the Bolt driver when installed; the REST endpoint remains the fallback
+        self.driver = None
+        if NEO4J_DRIVER_AVAILABLE and bolt_url:
+            self.driver = GraphDatabase.driver(bolt_url, auth=self.auth, max_connection_pool_size=10)
+    
+    def __enter__(self) -> "Neo4jSchemaManager":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def _drop_driver(self):
+        """Close the Bolt driver and fall back to the REST API"""
+        if self.driver is not None:
+            self.driver.close()
+            self.driver = None
+    
+    def close(self):
+        """Release pooled connections"""
+        if self.driver is not None:
+            self.driver.close()
+        self.session.close()
+        
     def wait_for_neo4j(self, max_attempts: int = 30) -> bool:
         """Wait for Neo4j to be ready"""
         print("⏳ Waiting for Neo4j to be ready...")
         
+        delay = self.initial_delay
+        rest_ready_since = None
         for attempt in range(max_attempts):
-            try:
-                response = requests.get(f"{self.neo4j_url}/db/data/", 
-                                     auth=self.auth, timeout=5)
-                if response.status_code == 200:
+            if self.driver is not None:
+                try:
+                    self.driver.verify_connectivity()
                     print("✅ Neo4j is ready!")
                     return True
-            except requests.exceptions.RequestException:
-                pass
+                except (DriverError, Neo4jError):
+                    pass
+            
+            if rest_ready_since is None:
+                try:
+                    response = self.session.get(f"{self.neo4j_url}/db/data/", timeout=5)
+                    if response.status_code == 200:
+                        if self.driver is None:
+                            print("✅ Neo4j is ready!")
+                            return True
+                        # HTTP usually comes up before Bolt during container
+                        # startup, so keep retrying Bolt for a short while
+                        rest_ready_since = time.monotonic()
+                except requests.exceptions.RequestException:
+                    pass
             
-            print(f"⏳ Attempt {attempt + 1}/{max_attempts}: Neo4j not ready yet...")
-            time.sleep(2)
+            if rest_ready_since is None:
+                print(f"⏳ Attempt {attempt + 1}/{max_attempts}: Neo4j not ready yet...")
+            elif time.monotonic() - rest_ready_since >= self.bolt_grace:
+                break
+            else:
+                print(f"⏳ Attempt {attempt + 1}/{max_attempts}: REST is up, waiting for Bolt...")
+            time.sleep(delay)
+            delay = min(delay * self.backoff, self.max_delay)
+        
+        if rest_ready_since is not None:
+            # REST answers but Bolt never did; send statements over REST
+            print("⚠️ Bolt endpoint unreachable, using the REST API")
+            self._drop_driver()
+            print("✅ Neo4j is ready!")
+            return True
         
         print("❌ Neo4j failed to start after maximum attempts")
         return False
     
     def execute_cypher(self, query: str, parameters: Dict[str, Any] = None) -> Dict[str, Any]:
         """Execute a Cypher query"""
+        return self.execute_cypher_batch([(query, parameters)])
+    
+    def execute_cypher_batch(self, statements: List[Tuple[str, Optional[Dict[str, Any]]]]) -> Dict[str, Any]:
+        """Execute several Cypher statements in a single transaction commit"""
+        if self.driver is not None:
+            try:
+                return self._execute_bolt_batch(statements)
+            except ServiceUnavailable as e:
+                print(f"⚠️ Bolt connection lost ({e}), falling back to the REST API")
+                self._drop_driver()
+        
         url = f"{self.neo4j_url}/db/data/transaction/commit"
         
         payload = {
@@ -47,20 +133,18 @@ class Neo4jSchemaManager:
                     "statement": query,
                     "parameters": parameters or {}
                 }
+                for query, parameters in statements
             ]
         }
         
         try:
-            response = requests.post(
-                url,
-                json=payload,
-                auth=self.auth,
-                headers={"Content-Type": "application/json"},
-                timeout=30
-            )
+            response = self.session.post(url, json=payload, timeout=30)
             
             if response.status_code == 200:
-                return response.json()
+                result = response.json()
+                for error in result.get("errors", []):
+                    print(f"❌ Statement error {error.get('code')}: {error.get('message')}")
+                return result
             else:
                 print(f"❌ Query failed: {response.status_code}")
                 print(f"Response: {response.text}")
@@ -70,6 +154,31 @@ class Neo4jSchemaManager:
             print(f"❌ Error executing query: {e}")
             return {}
     
+    def _execute_bolt_batch(self, statements: List[Tuple[str, Optional[Dict[str, Any]]]]) -> Dict[str, Any]:
+        """Run a statement batch in one Bolt transaction, shaped like the REST response"""
+        def run_statements(tx) -> List[Dict[str, Any]]:
+            results = []
+            for query, parameters in statements:
+                records = tx.run(query, parameters or {})
+                results.append({
+                    "columns": list(records.keys()),
+                    "data": [{"row": list(record.values())} for record in records]
+                })
+            return results
+        
+        try:
+            with self.driver.session() as session:
+                return {"results": session.execute_write(run_statements), "errors": []}
+        except Neo4jError as e:
+            print(f"❌ Statement error {e.code}: {e.message}")
+            return {"results": [], "errors": [{"code": e.code, "message": e.message}]}
+        except ServiceUnavailable:
+            # Handled by execute_cypher_batch, which retries over REST
+            raise
+        except DriverError as e:
+            print(f"❌ Error executing query: {e}")
+            return {}
+    
     def create_constraints_and_indexes(self) -> bool:
         """Create constraints and indexes"""
         print("🔧 Creating constraints and indexes...")
@@ -90,11 +199,10 @@ class Neo4jSchemaManager:
             "CREATE INDEX similarity_score_index IF NOT EXISTS FOR ()-[r:SIMILAR_TO]-() ON (r.similarity_score)",
         ]
         
-        for query in constraints_and_indexes:
-            result = self.execute_cypher(query)
-            if not result:
-                print(f"❌ Failed to execute: {query}")
-                return False
+        result = self.execute_cypher_batch([(query, None) for query in constraints_and_indexes])
+        if not result or result.get("errors"):
+            print("❌ Failed to create constraints and indexes")
+            return False
         
         print("✅ Constraints and indexes created successfully!")
         return True
@@ -103,152 +211,151 @@ class Neo4jSchemaManager:
         """Create sample data for testing"""
         print("🧪 Creating sample data...")
         
-        # Create sample entities
+        collections = [
+            {
+                "collection_id": "default",
+                "name": "Default Collection",
+                "description": "Default collection for all assets"
+            }
+        ]
+        
+        assets = [
+            {
+                "entity_id": "asset-001",
+                "asset_id": "asset-001",
+                "filename": "sample_video.mp4",
+                "mime_type": "video/mp4",
+                "file_size": 1024000,
+                "processing_status": "completed",
+                "metadata": json.dumps({"duration": 120.5, "resolution": "1920x1080"}),
+                "tags": ["video", "sample", "test"],
+                "collection_id": "default"
+            },
+            {
+                "entity_id": "asset-002",
+                "asset_id": "asset-002",
+                "filename": "sample_image.jpg",
+                "mime_type": "image/jpeg",
+                "file_size": 512000,
+                "processing_status": "completed",
+                "metadata": json.dumps({"width": 1920, "height": 1080}),
+                "tags": ["image", "sample", "test"],
+                "collection_id": "default"
+            }
+        ]
+        
+        segments = [
+            {
+                "entity_id": "segment-001",
+                "segment_id": "segment-001",
+                "asset_id": "asset-001",
+                "segment_type": "scene",
+                "sequence_number": 1,
+                "start_time": 0.0,
+                "end_time": 10.0,
+                "confidence_score": 0.95,
+                "content_description": "Opening scene with car",
+                "detected_objects": ["car", "road", "sky"],
+                "detected_text": ""
+            },
+            {
+                "entity_id": "segment-002",
+                "segment_id": "segment-002",
+                "asset_id": "asset-001",
+                "segment_type": "scene",
+                "sequence_number": 2,
+                "start_time": 10.0,
+                "end_time": 20.0,
+                "confidence_score": 0.88,
+                "content_description": "Car driving on highway",
+                "detected_objects": ["car", "highway", "trees"],
+                "detected_text": ""
+            }
+        ]
+        
+        contains_edges = [
+            {"from": "asset-001", "to": "segment-001", "metadata": json.dumps({"sequence": 1})},
+            {"from": "asset-001", "to": "segment-002", "metadata": json.dumps({"sequence": 2})}
+        ]
+        
+        similarity_edges = [
+            {
+                "from": "asset-001",
+                "to": "asset-002",
+                "similarity_score": 0.75,
+                "similarity_type": "content",
+                "metadata": json.dumps({"algorithm": "visual_similarity"})
+            },
+            {
+                "from": "segment-001",
+                "to": "segment-002",
+                "similarity_score": 0.82,
+                "similarity_type": "visual",
+                "metadata": json.dumps({"algorithm": "scene_similarity"})
+            }
+        ]
+        
+        # Parameterised UNWIND statements keep the query text stable so plans are cached
         sample_queries = [
             # Create Collections
-            """
-            CREATE (c:Collection {
-                collection_id: 'default',
-                name: 'Default Collection',
-                description: 'Default collection for all assets',
-                created_at: datetime(),
-                updated_at: datetime()
-            })
-            """,
+            ("""
+            UNWIND $collections AS row
+            CREATE (c:Collection)
+            SET c = row, c.created_at = datetime(), c.updated_at = datetime()
+            """, {"collections": collections}),
             
             # Create sample Assets
-            """
-            CREATE (a1:Asset:Entity {
-                entity_id: 'asset-001',
-                asset_id: 'asset-001',
-                filename: 'sample_video.mp4',
-                mime_type: 'video/mp4',
-                file_size: 1024000,
-                processing_status: 'completed',
-                created_at: datetime(),
-                updated_at: datetime(),
-                metadata: '{"duration": 120.5, "resolution": "1920x1080"}',
-                tags: ['video', 'sample', 'test'],
-                collection_id: 'default'
-            })
-            """,
-            
-            """
-            CREATE (a2:Asset:Entity {
-                entity_id: 'asset-002',
-                asset_id: 'asset-002',
-                filename: 'sample_image.jpg',
-                mime_type: 'image/jpeg',
-                file_size: 512000,
-                processing_status: 'completed',
-                created_at: datetime(),
-                updated_at: datetime(),
-                metadata: '{"width": 1920, "height": 1080}',
-                tags: ['image', 'sample', 'test'],
-                collection_id: 'default'
-            })
-            """,
+            ("""
+            UNWIND $assets AS row
+            CREATE (a:Asset:Entity)
+            SET a = row, a.created_at = datetime(), a.updated_at = datetime()
+            """, {"assets": assets}),
             
             # Create sample Segments
-            """
-            CREATE (s1:Segment:Entity {
-                entity_id: 'segment-001',
-                segment_id: 'segment-001',
-                asset_id: 'asset-001',
-                segment_type: 'scene',
-                sequence_number: 1,
-                start_time: 0.0,
-                end_time: 10.0,
-                confidence_score: 0.95,
-                content_description: 'Opening scene with car',
-                detected_objects: ['car', 'road', 'sky'],
-                detected_text: '',
-                created_at: datetime(),
-                updated_at: datetime()
-            })
-            """,
-            
-            """
-            CREATE (s2:Segment:Entity {
-                entity_id: 'segment-002',
-                segment_id: 'segment-002',
-                asset_id: 'asset-001',
-                segment_type: 'scene',
-                sequence_number: 2,
-                start_time: 10.0,
-                end_time: 20.0,
-                confidence_score: 0.88,
-                content_description: 'Car driving on highway',
-                detected_objects: ['car', 'highway', 'trees'],
-                detected_text: '',
-                created_at: datetime(),
-                updated_at: datetime()
-            })
-            """,
+            ("""
+            UNWIND $segments AS row
+            CREATE (s:Segment:Entity)
+            SET s = row, s.created_at = datetime(), s.updated_at = datetime()
+            """, {"segments": segments}),
             
             # Create relationships
-            """
-            MATCH (a1:Asset {asset_id: 'asset-001'}), (s1:Segment {segment_id: 'segment-001'})
-            CREATE (a1)-[:CONTAINS {
+            ("""
+            UNWIND $edges AS e
+            MATCH (a:Asset {asset_id: e.from}), (s:Segment {segment_id: e.to})
+            CREATE (a)-[:CONTAINS {
                 relationship_type: 'contains',
                 created_at: datetime(),
-                metadata: '{"sequence": 1}'
-            }]->(s1)
-            """,
-            
-            """
-            MATCH (a1:Asset {asset_id: 'asset-001'}), (s2:Segment {segment_id: 'segment-002'})
-            CREATE (a1)-[:CONTAINS {
-                relationship_type: 'contains',
-                created_at: datetime(),
-                metadata: '{"sequence": 2}'
-            }]->(s2)
-            """,
+                metadata: e.metadata
+            }]->(s)
+            """, {"edges": contains_edges}),
             
             # Create similarity relationships
-            """
-            MATCH (a1:Asset {asset_id: 'asset-001'}), (a2:Asset {asset_id: 'asset-002'})
-            CREATE (a1)-[:SIMILAR_TO {
-                similarity_score: 0.75,
-                similarity_type: 'content',
-                created_at: datetime(),
-                metadata: '{"algorithm": "visual_similarity"}'
-            }]->(a2)
-            """,
-            
-            """
-            MATCH (s1:Segment {segment_id: 'segment-001'}), (s2:Segment {segment_id: 'segment-002'})
-            CREATE (s1)-[:SIMILAR_TO {
-                similarity_score: 0.82,
-                similarity_type: 'visual',
+            ("""
+            UNWIND $edges AS e
+            MATCH (x:Entity {entity_id: e.from}), (y:Entity {entity_id: e.to})
+            CREATE (x)-[:SIMILAR_TO {
+                similarity_score: e.similarity_score,
+                similarity_type: e.similarity_type,
                 created_at: datetime(),
-                metadata: '{"algorithm": "scene_similarity"}'
-            }]->(s2)
-            """,
+                metadata: e.metadata
+            }]->(y)
+            """, {"edges": similarity_edges}),
             
             # Create collection relationships
-            """
-            MATCH (c:Collection {collection_id: 'default'}), (a1:Asset {asset_id: 'asset-001'})
-            CREATE (c)-[:CONTAINS {
-                relationship_type: 'contains',
-                created_at: datetime()
-            }]->(a1)
-            """,
-            
-            """
-            MATCH (c:Collection {collection_id: 'default'}), (a2:Asset {asset_id: 'asset-002'})
+            ("""
+            UNWIND $assets AS row
+            MATCH (c:Collection {collection_id: row.collection_id}), (a:Asset {asset_id: row.asset_id})
             CREATE (c)-[:CONTAINS {
                 relationship_type: 'contains',
                 created_at: datetime()
-            }]->(a2)
-            """
+            }]->(a)
+            """, {"assets": assets})
         ]
         
-        for query in sample_queries:
-            result = self.execute_cypher(query)
-            if not result:
-                print(f"❌ Failed to execute: {query}")
-                return False
+        result = self.execute_cypher_batch(sample_queries)
+        if not result or result.get("errors"):
+            print("❌ Failed to create sample data")
+            return False
         
         print("✅ Sample data created successfully!")
         return True
@@ -292,10 +399,12 @@ class Neo4jSchemaManager:
             }
         ]
         
-        for test in test_queries:
-            result = self.execute_cypher(test["query"])
-            if result and "results" in result and result["results"]:
-                print(f"✅ {test['name']}: {result['results'][0]['data']}")
+        result = self.execute_cypher_batch([(test["query"], None) for test in test_queries])
+        results = result.get("results", []) if result else []
+        
+        for index, test in enumerate(test_queries):
+            if index < len(results):
+                print(f"✅ {test['name']}: {results[index]['data']}")
             else:
                 print(f"❌ {test['name']} failed")
                 return False
@@ -304,22 +413,29 @@ class Neo4jSchemaManager:
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get database statistics"""
-        stats_query = """
-        MATCH (n)
-        OPTIONAL MATCH (n)-[r]->()
-        RETURN 
-            labels(n)[0] as label,
-            count(n) as count,
-            count(r) as relationships
-        ORDER BY count DESC
-        """
+        # Aggregate in Cypher so only one row per label / relationship type comes back
+        stats_queries = [
+            ("""
+            MATCH (n)
+            RETURN labels(n)[0] as label, count(n) as nodes
+            ORDER BY nodes DESC
+            """, None),
+            ("""
+            MATCH ()-[r]->()
+            RETURN type(r) as rel_type, count(r) as relationships
+            ORDER BY relationships DESC
+            """, None)
+        ]
         
-        result = self.execute_cypher(stats_query)
-        if result and "results" in result and result["results"]:
+        result = self.execute_cypher_batch(stats_queries)
+        if result and len(result.get("results", [])) == 2:
+            node_rows = result["results"][0]["data"]
+            relationship_rows = result["results"][1]["data"]
             return {
-                "statistics": result["results"][0]["data"],
-                "total_nodes": sum(row["row"][1] for row in result["results"][0]["data"]),
-                "total_relationships": sum(row["row"][2] for row in result["results"][0]["data"])
+                "statistics": node_rows,
+                "relationship_statistics": relationship_rows,
+                "total_nodes": sum(row["row"][1] for row in node_rows),
+                "total_relationships": sum(row["row"][1] for row in relationship_rows)
             }
         return {}
 
@@ -328,43 +444,43 @@ def main():
     print("🚀 DataFlux Neo4j Schema Setup")
     print("=" * 50)
     
-    manager = Neo4jSchemaManager()
+    with Neo4jSchemaManager() as manager:
     
-    # Wait for Neo4j to be ready
-    if not manager.wait_for_neo4j():
-        print("❌ Cannot proceed without Neo4j")
-        return False
+        # Wait for Neo4j to be ready
+        if not manager.wait_for_neo4j():
+            print("❌ Cannot proceed without Neo4j")
+            return False
     
-    # Create constraints and indexes
-    if not manager.create_constraints_and_indexes():
-        print("❌ Failed to create constraints and indexes")
-        return False
+        # Create constraints and indexes
+        if not manager.create_constraints_and_indexes():
+            print("❌ Failed to create constraints and indexes")
+            return False
     
-    # Create sample data
-    if not manager.create_sample_data():
-        print("❌ Failed to create sample data")
-        return False
+        # Create sample data
+        if not manager.create_sample_data():
+            print("❌ Failed to create sample data")
+            return False
     
-    # Test queries
-    if not manager.test_queries():
-        print("❌ Query tests failed")
-        return False
+        # Test queries
+        if not manager.test_queries():
+            print("❌ Query tests failed")
+            return False
     
-    # Get statistics
-    stats = manager.get_statistics()
-    if stats:
-        print(f"\n📊 Database Statistics:")
-        print(f"  Total Nodes: {stats.get('total_nodes', 0)}")
-        print(f"  Total Relationships: {stats.get('total_relationships', 0)}")
+        # Get statistics
+        stats = manager.get_statistics()
+        if stats:
+            print(f"\n📊 Database Statistics:")
+            print(f"  Total Nodes: {stats.get('total_nodes', 0)}")
+            print(f"  Total Relationships: {stats.get('total_relationships', 0)}")
     
-    print("\n🎉 Neo4j schema setup completed successfully!")
-    print("📊 Schema elements created:")
-    print("  - Nodes: Entity, Asset, Segment, Collection")
-    print("  - Relationships: CONTAINS, SIMILAR_TO")
-    print("  - Constraints: Unique IDs for all entities")
-    print("  - Indexes: Performance indexes on key properties")
+        print("\n🎉 Neo4j schema setup completed successfully!")
+        print("📊 Schema elements created:")
+        print("  - Nodes: Entity, Asset, Segment, Collection")
+        print("  - Relationships: CONTAINS, SIMILAR_TO")
+        print("  - Constraints: Unique IDs for all entities")
+        print("  - Indexes: Performance indexes on key properties")
     
-    return True
+        return True
 
 if __name__ == "__main__":
     success = main()
@@ -4,15 +4,297 @@ DataFlux Weaviate Schema Setup
 Creates the vector database schema for embeddings and similarity search
 """
 
+import asyncio
 import json
-import requests
+import httpx
 import time
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
+
+try:
+    import h2  # noqa: F401 - enables HTTP/2 in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+try:
+    import orjson
+    _dumps = orjson.dumps
+except ImportError:
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
+# Static payloads, serialized once at import
+_SCHEMA_DICT = {
+    "classes": [
+        {
+            "class": "Asset",
+            "description": "Media assets with embeddings",
+            "vectorizer": "none",  # We'll provide our own vectors
+            "properties": [
+                {
+                    "name": "entity_id",
+                    "dataType": ["string"],
+                    "description": "Unique entity identifier",
+                    "indexInverted": True
+                },
+                {
+                    "name": "filename",
+                    "dataType": ["string"],
+                    "description": "Original filename",
+                    "indexInverted": True
+                },
+                {
+                    "name": "mime_type",
+                    "dataType": ["string"],
+                    "description": "MIME type of the file",
+                    "indexInverted": True
+                },
+                {
+                    "name": "file_size",
+                    "dataType": ["int"],
+                    "description": "File size in bytes"
+                },
+                {
+                    "name": "processing_status",
+                    "dataType": ["string"],
+                    "description": "Processing status",
+                    "indexInverted": True
+                },
+                {
+                    "name": "created_at",
+                    "dataType": ["date"],
+                    "description": "Creation timestamp"
+                },
+                {
+                    "name": "metadata",
+                    "dataType": ["object"],
+                    "description": "Additional metadata"
+                },
+                {
+                    "name": "tags",
+                    "dataType": ["string[]"],
+                    "description": "Content tags",
+                    "indexInverted": True
+                },
+                {
+                    "name": "collection_id",
+                    "dataType": ["string"],
+                    "description": "Collection identifier",
+                    "indexInverted": True
+                }
+            ]
+        },
+        {
+            "class": "Segment",
+            "description": "Media segments (scenes, frames, audio clips)",
+            "vectorizer": "none",
+            "properties": [
+                {
+                    "name": "segment_id",
+                    "dataType": ["string"],
+                    "description": "Unique segment identifier",
+                    "indexInverted": True
+                },
+                {
+                    "name": "asset_id",
+                    "dataType": ["string"],
+                    "description": "Parent asset identifier",
+                    "indexInverted": True
+                },
+                {
+                    "name": "segment_type",
+                    "dataType": ["string"],
+                    "description": "Type of segment (scene, frame, clip)",
+                    "indexInverted": True
+                },
+                {
+                    "name": "sequence_number",
+                    "dataType": ["int"],
+                    "description": "Sequence number in parent asset"
+                },
+                {
+                    "name": "start_time",
+                    "dataType": ["number"],
+                    "description": "Start time in seconds"
+                },
+                {
+                    "name": "end_time",
+                    "dataType": ["number"],
+                    "description": "End time in seconds"
+                },
+                {
+                    "name": "confidence_score",
+                    "dataType": ["number"],
+                    "description": "Confidence score for this segment"
+                },
+                {
+                    "name": "content_description",
+                    "dataType": ["text"],
+                    "description": "Description of segment content",
+                    "indexInverted": True
+                },
+                {
+                    "name": "detected_objects",
+                    "dataType": ["string[]"],
+                    "description": "Detected objects in segment",
+                    "indexInverted": True
+                },
+                {
+                    "name": "detected_text",
+                    "dataType": ["text"],
+                    "description": "OCR detected text",
+                    "indexInverted": True
+                },
+                {
+                    "name": "audio_features",
+                    "dataType": ["object"],
+                    "description": "Audio feature data"
+                },
+                {
+                    "name": "visual_features",
+                    "dataType": ["object"],
+                    "description": "Visual feature data"
+                }
+            ]
+        },
+        {
+            "class": "Feature",
+            "description": "Extracted features and embeddings",
+            "vectorizer": "none",
+            "properties": [
+                {
+                    "name": "feature_id",
+                    "dataType": ["string"],
+                    "description": "Unique feature identifier",
+                    "indexInverted": True
+                },
+                {
+                    "name": "entity_id",
+                    "dataType": ["string"],
+                    "description": "Entity this feature belongs to",
+                    "indexInverted": True
+                },
+                {
+                    "name": "feature_type",
+                    "dataType": ["string"],
+                    "description": "Type of feature (visual, audio, text)",
+                    "indexInverted": True
+                },
+                {
+                    "name": "feature_domain",
+                    "dataType": ["string"],
+                    "description": "Domain of the feature",
+                    "indexInverted": True
+                },
+                {
+                    "name": "feature_name",
+                    "dataType": ["string"],
+                    "description": "Name of the specific feature",
+                    "indexInverted": True
+                },
+                {
+                    "name": "confidence_score",
+                    "dataType": ["number"],
+                    "description": "Confidence score for this feature"
+                },
+                {
+                    "name": "feature_data",
+                    "dataType": ["object"],
+                    "description": "Raw feature data"
+                },
+                {
+                    "name": "embedding_model",
+                    "dataType": ["string"],
+                    "description": "Model used for embedding",
+                    "indexInverted": True
+                },
+                {
+                    "name": "embedding_dimensions",
+                    "dataType": ["int"],
+                    "description": "Dimensions of the embedding vector"
+                },
+                {
+                    "name": "created_at",
+                    "dataType": ["date"],
+                    "description": "Feature extraction timestamp"
+                }
+            ]
+        }
+    ]
+}
+
+_SAMPLE_ASSET = {
+    "entity_id": "test-asset-001",
+    "filename": "sample_video.mp4",
+    "mime_type": "video/mp4",
+    "file_size": 1024000,
+    "processing_status": "completed",
+    "created_at": "2025-09-28T20:00:00Z",
+    "metadata": {
+        "duration": 120.5,
+        "resolution": "1920x1080",
+        "fps": 30
+    },
+    "tags": ["video", "sample", "test"],
+    "collection_id": "default"
+}
+
+def _batch_payload(objs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Wrap plain property dicts for the /batch/objects endpoint"""
+    return {
+        "objects": [
+            {
+                "class": obj.get("class", "Asset"),
+                "properties": {key: value for key, value in obj.items() if key != "class"}
+            }
+            for obj in objs
+        ]
+    }
+
+_SCHEMA_BYTES = _dumps(_SCHEMA_DICT)
+_SAMPLE_BATCH_BYTES = _dumps(_batch_payload([_SAMPLE_ASSET]))
+
+# Fail fast when the server is unreachable, but give large uploads room
+_TIMEOUT = httpx.Timeout(connect=2.0, read=30.0, write=30.0, pool=2.0)
+
+def _backoff_delay(attempt: int) -> float:
+    """Exponential backoff delay shared by readiness polling and retries"""
+    return min(2.0, 0.1 * (1.6 ** attempt))
 
 class WeaviateSchemaManager:
-    def __init__(self, weaviate_url: str = "http://localhost:2005"):
+    def __init__(self, weaviate_url: str = "http://localhost:2005", max_retries: int = 3):
         self.weaviate_url = weaviate_url
+        self.max_retries = max_retries
         self.client_url = f"{weaviate_url}/v1"
+        self._schema_cache: Optional[Dict[str, Any]] = None
+        
+        # One pooled client keeps connections alive (and multiplexed over HTTP/2
+        # when available) across schema calls
+        self.session = httpx.Client(
+            base_url=self.client_url,
+            http2=HTTP2_AVAILABLE,
+            timeout=_TIMEOUT,
+            limits=httpx.Limits(max_keepalive_connections=20)
+        )
+    
+    def __enter__(self) -> "WeaviateSchemaManager":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def close(self):
+        """Release pooled connections"""
+        self.session.close()
+    
+    def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send a request, retrying connection failures with backoff"""
+        for attempt in range(self.max_retries - 1):
+            try:
+                return self.session.request(method, url, **kwargs)
+            except httpx.ConnectError:
+                time.sleep(_backoff_delay(attempt))
+        return self.session.request(method, url, **kwargs)
         
     def wait_for_weaviate(self, max_attempts: int = 30) -> bool:
         """Wait for Weaviate to be ready"""
@@ -20,15 +302,16 @@ class WeaviateSchemaManager:
         
         for attempt in range(max_attempts):
             try:
-                response = requests.get(f"{self.client_url}/meta", timeout=5)
+                # Short timeout so an unreachable server fails fast
+                response = self.session.get("/meta", timeout=1)
                 if response.status_code == 200:
                     print("✅ Weaviate is ready!")
                     return True
-            except requests.exceptions.RequestException:
+            except httpx.HTTPError:
                 pass
             
             print(f"⏳ Attempt {attempt + 1}/{max_attempts}: Weaviate not ready yet...")
-            time.sleep(2)
+            time.sleep(_backoff_delay(attempt))
         
         print("❌ Weaviate failed to start after maximum attempts")
         return False
@@ -37,216 +320,17 @@ class WeaviateSchemaManager:
         """Create the DataFlux schema in Weaviate"""
         print("🔧 Creating DataFlux schema in Weaviate...")
         
-        # Define the schema
-        schema = {
-            "classes": [
-                {
-                    "class": "Asset",
-                    "description": "Media assets with embeddings",
-                    "vectorizer": "none",  # We'll provide our own vectors
-                    "properties": [
-                        {
-                            "name": "entity_id",
-                            "dataType": ["string"],
-                            "description": "Unique entity identifier",
-                            "indexInverted": True
-                        },
-                        {
-                            "name": "filename",
-                            "dataType": ["string"],
-                            "description": "Original filename",
-                            "indexInverted": True
-                        },
-                        {
-                            "name": "mime_type",
-                            "dataType": ["string"],
-                            "description": "MIME type of the file",
-                            "indexInverted": True
-                        },
-                        {
-                            "name": "file_size",
-                            "dataType": ["int"],
-                            "description": "File size in bytes"
-                        },
-                        {
-                            "name": "processing_status",
-                            "dataType": ["string"],
-                            "description": "Processing status",
-                            "indexInverted": True
-                        },
-                        {
-                            "name": "created_at",
-                            "dataType": ["date"],
-                            "description": "Creation timestamp"
-                        },
-                        {
-                            "name": "metadata",
-                            "dataType": ["object"],
-                            "description": "Additional metadata"
-                        },
-                        {
-                            "name": "tags",
-                            "dataType": ["string[]"],
-                            "description": "Content tags",
-                            "indexInverted": True
-                        },
-                        {
-                            "name": "collection_id",
-                            "dataType": ["string"],
-                            "description": "Collection identifier",
-                            "indexInverted": True
-                        }
-                    ]
-                },
-                {
-                    "class": "Segment",
-                    "description": "Media segments (scenes, frames, audio clips)",
-                    "vectorizer": "none",
-                    "properties": [
-                        {
-                            "name": "segment_id",
-                            "dataType": ["string"],
-                            "description": "Unique segment identifier",
-                            "indexInverted": True
-                        },
-                        {
-                            "name": "asset_id",
-                            "dataType": ["string"],
-                            "description": "Parent asset identifier",
-                            "indexInverted": True
-                        },
-                        {
-                            "name": "segment_type",
-                            "dataType": ["string"],
-                            "description": "Type of segment (scene, frame, clip)",
-                            "indexInverted": True
-                        },
-                        {
-                            "name": "sequence_number",
-                            "dataType": ["int"],
-                            "description": "Sequence number in parent asset"
-                        },
-                        {
-                            "name": "start_time",
-                            "dataType": ["number"],
-                            "description": "Start time in seconds"
-                        },
-                        {
-                            "name": "end_time",
-                            "dataType": ["number"],
-                            "description": "End time in seconds"
-                        },
-                        {
-                            "name": "confidence_score",
-                            "dataType": ["number"],
-                            "description": "Confidence score for this segment"
-                        },
-                        {
-                            "name": "content_description",
-                            "dataType": ["text"],
-                            "description": "Description of segment content",
-                            "indexInverted": True
-                        },
-                        {
-                            "name": "detected_objects",
-                            "dataType": ["string[]"],
-                            "description": "Detected objects in segment",
-                            "indexInverted": True
-                        },
-                        {
-                            "name": "detected_text",
-                            "dataType": ["text"],
-                            "description": "OCR detected text",
-                            "indexInverted": True
-                        },
-                        {
-                            "name": "audio_features",
-                            "dataType": ["object"],
-                            "description": "Audio feature data"
-                        },
-                        {
-                            "name": "visual_features",
-                            "dataType": ["object"],
-                            "description": "Visual feature data"
-                        }
-                    ]
-                },
-                {
-                    "class": "Feature",
-                    "description": "Extracted features and embeddings",
-                    "vectorizer": "none",
-                    "properties": [
-                        {
-                            "name": "feature_id",
-                            "dataType": ["string"],
-                            "description": "Unique feature identifier",
-                            "indexInverted": True
-                        },
-                        {
-                            "name": "entity_id",
-                            "dataType": ["string"],
-                            "description": "Entity this feature belongs to",
-                            "indexInverted": True
-                        },
-                        {
-                            "name": "feature_type",
-                            "dataType": ["string"],
-                            "description": "Type of feature (visual, audio, text)",
-                            "indexInverted": True
-                        },
-                        {
-                            "name": "feature_domain",
-                            "dataType": ["string"],
-                            "description": "Domain of the feature",
-                            "indexInverted": True
-                        },
-                        {
-                            "name": "feature_name",
-                            "dataType": ["string"],
-                            "description": "Name of the specific feature",
-                            "indexInverted": True
-                        },
-                        {
-                            "name": "confidence_score",
-                            "dataType": ["number"],
-                            "description": "Confidence score for this feature"
-                        },
-                        {
-                            "name": "feature_data",
-                            "dataType": ["object"],
-                            "description": "Raw feature data"
-                        },
-                        {
-                            "name": "embedding_model",
-                            "dataType": ["string"],
-                            "description": "Model used for embedding",
-                            "indexInverted": True
-                        },
-                        {
-                            "name": "embedding_dimensions",
-                            "dataType": ["int"],
-                            "description": "Dimensions of the embedding vector"
-                        },
-                        {
-                            "name": "created_at",
-                            "dataType": ["date"],
-                            "description": "Feature extraction timestamp"
-                        }
-                    ]
-                }
-            ]
-        }
-        
         try:
             # Create schema
-            response = requests.post(
-                f"{self.client_url}/schema",
-                json=schema,
-                headers={"Content-Type": "application/json"},
-                timeout=30
+            response = self._request(
+                "POST",
+                "/schema",
+                content=_SCHEMA_BYTES,
+                headers={"Content-Type": "application/json"}
             )
             
             if response.status_code == 200:
+                self._schema_cache = None
                 print("✅ Schema created successfully!")
                 return True
             else:
@@ -254,24 +338,28 @@ class WeaviateSchemaManager:
                 print(f"Response: {response.text}")
                 return False
                 
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             print(f"❌ Error creating schema: {e}")
             return False
     
-    def get_schema(self) -> Dict[str, Any]:
-        """Get the current schema"""
+    def get_schema(self, force: bool = False) -> Dict[str, Any]:
+        """Get the current schema, served from cache until the schema is mutated"""
+        if self._schema_cache is not None and not force:
+            return self._schema_cache
+        
         try:
-            response = requests.get(f"{self.client_url}/schema", timeout=10)
+            response = self._request("GET", "/schema")
             if response.status_code == 200:
-                return response.json()
+                self._schema_cache = response.json()
+                return self._schema_cache
             else:
                 print(f"❌ Failed to get schema: {response.status_code}")
                 return {}
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             print(f"❌ Error getting schema: {e}")
             return {}
     
-    def delete_schema(self) -> bool:
+    async def delete_schema(self) -> bool:
         """Delete the entire schema (for testing)"""
         print("🗑️ Deleting existing schema...")
         
@@ -281,49 +369,111 @@ class WeaviateSchemaManager:
                 print("ℹ️ No schema to delete")
                 return True
             
-            for class_info in schema['classes']:
-                class_name = class_info['class']
-                response = requests.delete(f"{self.client_url}/schema/{class_name}", timeout=10)
-                if response.status_code == 200:
+            class_names = [class_info['class'] for class_info in schema['classes']]
+            
+            # Issue all class deletions concurrently
+            async with httpx.AsyncClient(base_url=self.client_url, http2=HTTP2_AVAILABLE, timeout=_TIMEOUT) as client:
+                responses = await asyncio.gather(
+                    *[client.delete(f"/schema/{class_name}") for class_name in class_names],
+                    return_exceptions=True
+                )
+            
+            self._schema_cache = None
+            
+            for class_name, response in zip(class_names, responses):
+                if isinstance(response, Exception):
+                    print(f"❌ Error deleting class {class_name}: {response}")
+                elif response.status_code == 200:
                     print(f"✅ Deleted class: {class_name}")
                 else:
                     print(f"❌ Failed to delete class {class_name}: {response.status_code}")
             
             return True
             
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             print(f"❌ Error deleting schema: {e}")
             return False
     
+    def _count_batch_successes(self, status_code: int, body: Any) -> int:
+        """Count objects in a batch response that were stored without errors"""
+        if status_code != 200:
+            print(f"❌ Batch insert failed: {status_code}")
+            return 0
+        
+        inserted = 0
+        for item in body:
+            errors = (item.get("result") or {}).get("errors")
+            if errors:
+                print(f"❌ Failed to insert object: {errors}")
+            else:
+                inserted += 1
+        return inserted
+    
+    def insert_objects(self, objs: List[Dict[str, Any]], batch_size: int = 128) -> int:
+        """Insert objects through the batch API; returns the number stored"""
+        inserted = 0
+        
+        for start in range(0, len(objs), batch_size):
+            try:
+                response = self._request(
+                    "POST",
+                    "/batch/objects",
+                    content=_dumps(_batch_payload(objs[start:start + batch_size])),
+                    headers={"Content-Type": "application/json"}
+                )
+                body = response.json() if response.status_code == 200 else None
+                inserted += self._count_batch_successes(response.status_code, body)
+            except httpx.HTTPError as e:
+                print(f"❌ Error inserting batch: {e}")
+        
+        return inserted
+    
+    async def insert_objects_async(self, objs: List[Dict[str, Any]], batch_size: int = 128,
+                                   max_concurrency: int = 4) -> int:
+        """Insert objects through the batch API with concurrent batch requests"""
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async with httpx.AsyncClient(
+            base_url=self.client_url,
+            http2=HTTP2_AVAILABLE,
+            timeout=_TIMEOUT,
+            limits=httpx.Limits(max_connections=max_concurrency)
+        ) as client:
+            async def post_batch(chunk: List[Dict[str, Any]]) -> int:
+                async with semaphore:
+                    try:
+                        response = await client.post(
+                            "/batch/objects",
+                            content=_dumps(_batch_payload(chunk)),
+                            headers={"Content-Type": "application/json"}
+                        )
+                    except httpx.HTTPError as e:
+                        print(f"❌ Error inserting batch: {e}")
+                        return 0
+                    body = response.json() if response.status_code == 200 else None
+                    return self._count_batch_successes(response.status_code, body)
+            
+            counts = await asyncio.gather(*[
+                post_batch(objs[start:start + batch_size])
+                for start in range(0, len(objs), batch_size)
+            ])
+        
+        return sum(counts)
+    
     def test_schema(self) -> bool:
         """Test the schema by adding a sample object"""
         print("🧪 Testing schema with sample data...")
         
-        sample_asset = {
-            "entity_id": "test-asset-001",
-            "filename": "sample_video.mp4",
-            "mime_type": "video/mp4",
-            "file_size": 1024000,
-            "processing_status": "completed",
-            "created_at": "2025-09-28T20:00:00Z",
-            "metadata": {
-                "duration": 120.5,
-                "resolution": "1920x1080",
-                "fps": 30
-            },
-            "tags": ["video", "sample", "test"],
-            "collection_id": "default"
-        }
-        
         try:
-            response = requests.post(
-                f"{self.client_url}/objects",
-                json=sample_asset,
-                headers={"Content-Type": "application/json"},
-                timeout=10
+            response = self._request(
+                "POST",
+                "/batch/objects",
+                content=_SAMPLE_BATCH_BYTES,
+                headers={"Content-Type": "application/json"}
             )
             
-            if response.status_code == 200:
+            body = response.json() if response.status_code == 200 else None
+            if self._count_batch_successes(response.status_code, body) == 1:
                 print("✅ Sample asset created successfully!")
                 return True
             else:
@@ -331,7 +481,7 @@ class WeaviateSchemaManager:
                 print(f"Response: {response.text}")
                 return False
                 
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             print(f"❌ Error creating sample asset: {e}")
             return False
 
@@ -340,33 +490,33 @@ def main():
     print("🚀 DataFlux Weaviate Schema Setup")
     print("=" * 50)
     
-    manager = WeaviateSchemaManager()
+    with WeaviateSchemaManager() as manager:
     
-    # Wait for Weaviate to be ready
-    if not manager.wait_for_weaviate():
-        print("❌ Cannot proceed without Weaviate")
-        return False
+        # Wait for Weaviate to be ready
+        if not manager.wait_for_weaviate():
+            print("❌ Cannot proceed without Weaviate")
+            return False
     
-    # Delete existing schema (for clean setup)
-    manager.delete_schema()
+        # Delete existing schema (for clean setup)
+        asyncio.run(manager.delete_schema())
     
-    # Create new schema
-    if not manager.create_schema():
-        print("❌ Failed to create schema")
-        return False
+        # Create new schema
+        if not manager.create_schema():
+            print("❌ Failed to create schema")
+            return False
     
-    # Test the schema
-    if not manager.test_schema():
-        print("❌ Schema test failed")
-        return False
+        # Test the schema
+        if not manager.test_schema():
+            print("❌ Schema test failed")
+            return False
     
-    print("\n🎉 Weaviate schema setup completed successfully!")
-    print("📊 Schema classes created:")
-    print("  - Asset: Media assets with embeddings")
-    print("  - Segment: Media segments (scenes, frames, clips)")
-    print("  - Feature: Extracted features and embeddings")
+        print("\n🎉 Weaviate schema setup completed successfully!")
+        print("📊 Schema classes created:")
+        print("  - Asset: Media assets with embeddings")
+        print("  - Segment: Media segments (scenes, frames, clips)")
+        print("  - Feature: Extracted features and embeddings")
     
-    return True
+        return True
 
 if __name__ == "__main__":
     success = main()
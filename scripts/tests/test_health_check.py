@@ -0,0 +1,125 @@
+"""
+DataFlux Health Check - Unit Tests
+"""
+
+import pytest
+import asyncio
+import importlib.util
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+# health-check.py is a script, not an importable module name
+_spec = importlib.util.spec_from_file_location(
+    "health_check", Path(__file__).parent.parent / "health-check.py"
+)
+health_check = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(health_check)
+
+def _result(service: str, status: str) -> "health_check.HealthCheckResult":
+    return health_check.HealthCheckResult(
+        service=service,
+        status=status,
+        response_time=0.01,
+        timestamp=datetime.now(),
+        details={}
+    )
+
+class TestCircuitBreaker:
+    """Test cases for the result cache and circuit breaker"""
+    
+    @pytest.fixture
+    def checker(self):
+        """Checker whose probes are mocked, with no failure caching"""
+        checker = health_check.DataFluxHealthChecker(
+            cache_ttl=5.0, failure_ttl=0.0, failure_threshold=3, circuit_open_seconds=30.0
+        )
+        checker._probe_service = AsyncMock()
+        return checker
+    
+    @pytest.fixture
+    def svc(self, checker):
+        """First configured service"""
+        return checker._svc_list[0]
+    
+    def test_healthy_result_is_cached(self, checker, svc):
+        """A healthy service is not probed again within its TTL"""
+        checker._probe_service.return_value = _result(svc.name, "healthy")
+        
+        async def run():
+            return [await checker.check_service_health(svc) for _ in range(3)]
+        
+        results = asyncio.run(run())
+        assert all(r.status == "healthy" for r in results)
+        assert checker._probe_service.await_count == 1
+        # Stable services are polled less often
+        assert checker._ttl[svc.name] == 10.0
+    
+    def test_circuit_opens_after_threshold(self, checker, svc):
+        """Consecutive failures open the circuit and stop probing"""
+        checker._probe_service.return_value = _result(svc.name, "unhealthy")
+        
+        async def run():
+            return [await checker.check_service_health(svc) for _ in range(5)]
+        
+        results = asyncio.run(run())
+        assert checker._probe_service.await_count == 3
+        assert all(r.status == "unhealthy" for r in results)
+        assert results[-1].error.startswith("Circuit open after 3 consecutive failures")
+    
+    def test_circuit_closes_after_cooldown(self, checker, svc):
+        """Once the cooldown passes the service is probed again and success resets it"""
+        checker._probe_service.return_value = _result(svc.name, "unhealthy")
+        
+        async def run():
+            for _ in range(3):
+                await checker.check_service_health(svc)
+            checker._circuit_open_until[svc.name] = 0
+            checker._probe_service.return_value = _result(svc.name, "healthy")
+            return await checker.check_service_health(svc)
+        
+        assert asyncio.run(run()).status == "healthy"
+        assert checker._probe_service.await_count == 4
+        assert checker._failures[svc.name] == 0
+        assert svc.name not in checker._circuit_open_until
+    
+    def test_force_refresh_bypasses_open_circuit(self, checker, svc):
+        """Forced checks always probe the service"""
+        checker._probe_service.return_value = _result(svc.name, "unhealthy")
+        
+        async def run():
+            for _ in range(3):
+                await checker.check_service_health(svc)
+            return await checker.check_service_health(svc, force_refresh=True)
+        
+        asyncio.run(run())
+        assert checker._probe_service.await_count == 4
+
+class TestWaitForServices:
+    """Test cases for wait_for_services"""
+    
+    @pytest.fixture
+    def checker(self):
+        """Checker with mocked probes and a fast backoff"""
+        checker = health_check.DataFluxHealthChecker(initial_delay=0.01, max_delay=0.02)
+        checker._probe_service = AsyncMock()
+        return checker
+    
+    def test_returns_once_services_are_healthy(self, checker):
+        """Services that come up during the wait are reported ready"""
+        attempts = []
+        
+        async def probe(svc):
+            attempts.append(svc.name)
+            healthy = attempts.count(svc.name) >= 2
+            return _result(svc.name, "healthy" if healthy else "unhealthy")
+        
+        checker._probe_service.side_effect = probe
+        ready = asyncio.run(checker.wait_for_services(["query-service"], max_wait=5))
+        assert ready
+        assert attempts == ["query-service", "query-service"]
+    
+    def test_times_out(self, checker):
+        """Services that never become healthy time out"""
+        checker._probe_service.side_effect = lambda svc: _result(svc.name, "unhealthy")
+        assert not asyncio.run(checker.wait_for_services(["query-service"], max_wait=0.05))
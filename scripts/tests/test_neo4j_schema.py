@@ -0,0 +1,98 @@
+"""
+DataFlux Neo4j Schema Setup - Unit Tests
+"""
+
+import pytest
+import importlib.util
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+# setup-neo4j-schema.py is a script, not an importable module name
+_spec = importlib.util.spec_from_file_location(
+    "setup_neo4j_schema", Path(__file__).parent.parent / "setup-neo4j-schema.py"
+)
+neo4j_schema = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(neo4j_schema)
+
+class DriverError(Exception):
+    pass
+
+class ServiceUnavailable(DriverError):
+    pass
+
+class Neo4jError(Exception):
+    pass
+
+@pytest.fixture(autouse=True)
+def driver_exceptions():
+    """Stand in for neo4j.exceptions, which may not be installed"""
+    with patch.object(neo4j_schema, 'DriverError', DriverError, create=True), \
+            patch.object(neo4j_schema, 'ServiceUnavailable', ServiceUnavailable, create=True), \
+            patch.object(neo4j_schema, 'Neo4jError', Neo4jError, create=True):
+        yield
+
+@pytest.fixture
+def manager():
+    """Manager with a mocked HTTP session and Bolt driver"""
+    manager = neo4j_schema.Neo4jSchemaManager(initial_delay=0.001, max_delay=0.001, bolt_grace=0.05)
+    manager.session = Mock()
+    manager.session.post.return_value = Mock(status_code=200, json=Mock(return_value={"results": [{}, {}], "errors": []}))
+    manager.session.get.return_value = Mock(status_code=200)
+    manager.driver = Mock()
+    return manager
+
+STATEMENTS = [("CREATE (n:Asset {id: $id})", {"id": "a"}), ("MATCH (n) RETURN n", None)]
+
+class TestExecuteCypherBatch:
+    """Test cases for batched Cypher execution"""
+    
+    def test_rest_batch_is_one_commit(self, manager):
+        """Without Bolt every statement goes out in a single commit request"""
+        manager.driver = None
+        result = manager.execute_cypher_batch(STATEMENTS)
+        
+        assert result["errors"] == []
+        manager.session.post.assert_called_once()
+        payload = manager.session.post.call_args.kwargs["json"]
+        assert payload["statements"] == [
+            {"statement": "CREATE (n:Asset {id: $id})", "parameters": {"id": "a"}},
+            {"statement": "MATCH (n) RETURN n", "parameters": {}}
+        ]
+    
+    def test_lost_bolt_connection_falls_back_to_rest(self, manager):
+        """ServiceUnavailable drops the driver and retries the batch over REST"""
+        driver = manager.driver
+        driver.session.side_effect = ServiceUnavailable("connection refused")
+        
+        result = manager.execute_cypher_batch(STATEMENTS)
+        
+        assert result["errors"] == []
+        assert manager.driver is None
+        driver.close.assert_called_once()
+        manager.session.post.assert_called_once()
+
+class TestWaitForNeo4j:
+    """Test cases for wait_for_neo4j"""
+    
+    def test_bolt_gets_a_grace_period(self, manager):
+        """Bolt coming up shortly after REST is still used"""
+        manager.driver.verify_connectivity.side_effect = [DriverError(), DriverError(), None]
+        
+        assert manager.wait_for_neo4j()
+        assert manager.driver is not None
+    
+    def test_unreachable_bolt_falls_back_to_rest(self, manager):
+        """Bolt still down after the grace period is dropped for REST"""
+        driver = manager.driver
+        driver.verify_connectivity.side_effect = DriverError()
+        
+        assert manager.wait_for_neo4j()
+        assert manager.driver is None
+        driver.close.assert_called_once()
+    
+    def test_nothing_reachable(self, manager):
+        """Neither endpoint answering fails after max_attempts"""
+        manager.driver.verify_connectivity.side_effect = DriverError()
+        manager.session.get.side_effect = neo4j_schema.requests.exceptions.ConnectionError()
+        
+        assert not manager.wait_for_neo4j(max_attempts=3)
@@ -4,42 +4,68 @@ Audio Analyzer for DataFlux Analysis Service
 
 import asyncio
 import logging
-from typing import Dict, List, Any
-import numpy as np
+from typing import Dict, FrozenSet, List, Any, Optional, Tuple
 
-from .base import BaseAnalyzer
+try:
+    import librosa
+    LIBROSA_AVAILABLE = True
+except ImportError:
+    LIBROSA_AVAILABLE = False
+
+from .base import BaseAnalyzer, Feature, Segment
 
 logger = logging.getLogger(__name__)
 
+# Placeholder MFCC vector until real extraction lands
+_MOCK_MFCC = (0.0,) * 13
+
+# Static metadata templates shared by every result
+_AUDIO_PROPS_METADATA = {'analyzer': 'audio_properties'}
+_FEATURE_EXTRACTION_METADATA = {'analyzer': 'feature_extraction'}
+_SPEECH_DETECTION_METADATA = {'analyzer': 'speech_detection'}
+
+def _compute_audio_features(y: Any, sr: int) -> Dict[str, Any]:
+    """Compute MFCC and spectral features; runs in a worker thread"""
+    mono = librosa.to_mono(y) if y.ndim > 1 else y
+    return {
+        'mfcc': librosa.feature.mfcc(y=mono, sr=sr, n_mfcc=13).mean(axis=1).tolist(),
+        'spectral_centroid': float(librosa.feature.spectral_centroid(y=mono, sr=sr).mean()),
+        'spectral_rolloff': float(librosa.feature.spectral_rolloff(y=mono, sr=sr).mean()),
+        'zero_crossing_rate': float(librosa.feature.zero_crossing_rate(mono).mean())
+    }
+
 class AudioAnalyzer(BaseAnalyzer):
     """Audio content analyzer with feature extraction"""
     
-    def __init__(self):
-        super().__init__()
-        self.supported_formats = [
-            'audio/mp3', 'audio/wav', 'audio/flac', 'audio/ogg',
-            'audio/aac', 'audio/m4a', 'audio/wma'
-        ]
+    __slots__ = ()
     
-    def get_supported_formats(self) -> List[str]:
-        return self.supported_formats
+    SUPPORTED_FORMATS: FrozenSet[str] = frozenset({
+        'audio/mp3', 'audio/wav', 'audio/flac', 'audio/ogg',
+        'audio/aac', 'audio/m4a', 'audio/wma'
+    })
+    
+    def get_supported_formats(self) -> FrozenSet[str]:
+        """Return the (immutable) set of supported MIME types"""
+        return self.SUPPORTED_FORMATS
     
     async def analyze(self, file_path: str, asset_data: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze audio file"""
         self.log_analysis_start(file_path, asset_data)
         
         try:
-            if not self.validate_file(file_path):
+            if not await asyncio.to_thread(self.validate_file, file_path):
                 return self.create_error_result("Invalid file")
             
-            # Run analysis tasks
-            tasks = [
-                self._analyze_audio_properties(file_path),
-                self._extract_features(file_path),
-                self._detect_speech(file_path)
-            ]
+            # Decode once and share the samples with every analysis task
+            y, sr = await self._decode(file_path)
             
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+            # Only feature extraction awaits real work (a worker thread);
+            # the other steps are plain dict builders and run inline
+            results = (
+                self._analyze_audio_properties(y, sr),
+                await self._extract_features(y, sr),
+                self._detect_speech(y, sr)
+            )
             
             # Combine results
             segments = []
@@ -47,21 +73,16 @@ class AudioAnalyzer(BaseAnalyzer):
             embeddings = []
             
             for result in results:
-                if isinstance(result, Exception):
-                    logger.error(f"Audio analysis task failed", error=str(result))
-                    continue
-                
-                if isinstance(result, dict):
-                    segments.extend(result.get('segments', []))
-                    features.extend(result.get('features', []))
-                    embeddings.extend(result.get('embeddings', []))
+                segments.extend(result['segments'])
+                features.extend(result['features'])
+                embeddings.extend(result['embeddings'])
             
             result = self.create_success_result(
                 segments=segments,
                 features=features,
                 embeddings=embeddings,
                 metadata={
-                    'audio_info': await self._get_audio_info(file_path)
+                    'audio_info': self._get_audio_info(y, sr)
                 }
             )
             
@@ -69,27 +90,33 @@ class AudioAnalyzer(BaseAnalyzer):
             return result
             
         except Exception as e:
-            logger.error(f"Audio analysis failed", error=str(e))
+            logger.exception("Audio analysis failed")
             return self.create_error_result(str(e))
     
-    async def _analyze_audio_properties(self, file_path: str) -> Dict[str, Any]:
+    async def _decode(self, file_path: str) -> Tuple[Optional[Any], Optional[int]]:
+        """Decode the audio file once; returns (None, None) without librosa"""
+        if not LIBROSA_AVAILABLE:
+            return None, None
+        return await asyncio.to_thread(librosa.load, file_path, sr=None, mono=False)
+    
+    def _analyze_audio_properties(self, y: Optional[Any], sr: Optional[int]) -> Dict[str, Any]:
         """Analyze basic audio properties"""
         try:
-            # Mock audio properties analysis
-            # In production, use librosa or similar
-            
-            features = [{
-                'type': 'audio_properties',
-                'domain': 'audio',
-                'confidence': 0.8,
-                'data': {
-                    'duration': 0,  # Would be calculated from actual audio
-                    'sample_rate': 44100,
-                    'channels': 2,
+            # Falls back to mock values when the audio could not be decoded
+            info = self._get_audio_info(y, sr)
+            
+            features = [Feature(
+                type='audio_properties',
+                domain='audio',
+                confidence=0.8,
+                data={
+                    'duration': info['duration'],
+                    'sample_rate': info['sample_rate'],
+                    'channels': info['channels'],
                     'bitrate': 128
                 },
-                'metadata': {'analyzer': 'audio_properties'}
-            }]
+                metadata=_AUDIO_PROPS_METADATA
+            )]
             
             return {
                 'segments': [],
@@ -97,28 +124,34 @@ class AudioAnalyzer(BaseAnalyzer):
                 'embeddings': []
             }
             
-        except Exception as e:
-            logger.error(f"Audio properties analysis failed", error=str(e))
+        except Exception:
+            logger.exception("Audio properties analysis failed")
             return {'segments': [], 'features': [], 'embeddings': []}
     
-    async def _extract_features(self, file_path: str) -> Dict[str, Any]:
+    async def _extract_features(self, y: Optional[Any], sr: Optional[int]) -> Dict[str, Any]:
         """Extract audio features"""
         try:
-            # Mock feature extraction
-            # In production, extract MFCC, spectral features, etc.
-            
-            features = [{
-                'type': 'audio_features',
-                'domain': 'audio',
-                'confidence': 0.7,
-                'data': {
-                    'mfcc': np.random.rand(13).tolist(),  # Mock MFCC features
+            if y is None:
+                # Mock feature extraction when librosa is unavailable
+                data = {
+                    'mfcc': list(_MOCK_MFCC),  # Mock MFCC features
                     'spectral_centroid': 0.5,
                     'spectral_rolloff': 0.8,
                     'zero_crossing_rate': 0.1
-                },
-                'metadata': {'analyzer': 'feature_extraction'}
-            }]
+                }
+            else:
+                # A thread rather than a process: librosa's numpy/numba kernels
+                # release the GIL, and the samples are not pickled across a
+                # process boundary
+                data = await asyncio.to_thread(_compute_audio_features, y, sr)
+            
+            features = [Feature(
+                type='audio_features',
+                domain='audio',
+                confidence=0.7,
+                data=data,
+                metadata=_FEATURE_EXTRACTION_METADATA
+            )]
             
             return {
                 'segments': [],
@@ -126,37 +159,37 @@ class AudioAnalyzer(BaseAnalyzer):
                 'embeddings': []
             }
             
-        except Exception as e:
-            logger.error(f"Feature extraction failed", error=str(e))
+        except Exception:
+            logger.exception("Feature extraction failed")
             return {'segments': [], 'features': [], 'embeddings': []}
     
-    async def _detect_speech(self, file_path: str) -> Dict[str, Any]:
+    def _detect_speech(self, y: Optional[Any], sr: Optional[int]) -> Dict[str, Any]:
         """Detect speech segments"""
         try:
             # Mock speech detection
             # In production, use speech recognition libraries
             
-            segments = [{
-                'type': 'speech',
-                'start_time': 0.0,
-                'end_time': 10.0,
-                'confidence': 0.8,
-                'metadata': {
+            segments = [Segment(
+                type='speech',
+                start_time=0.0,
+                end_time=10.0,
+                confidence=0.8,
+                metadata={
                     'speech_detected': True,
                     'language': 'unknown'
                 }
-            }]
+            )]
             
-            features = [{
-                'type': 'speech_detection',
-                'domain': 'audio',
-                'confidence': 0.8,
-                'data': {
+            features = [Feature(
+                type='speech_detection',
+                domain='audio',
+                confidence=0.8,
+                data={
                     'has_speech': True,
                     'speech_segments': len(segments)
                 },
-                'metadata': {'analyzer': 'speech_detection'}
-            }]
+                metadata=_SPEECH_DETECTION_METADATA
+            )]
             
             return {
                 'segments': segments,
@@ -164,21 +197,23 @@ class AudioAnalyzer(BaseAnalyzer):
                 'embeddings': []
             }
             
-        except Exception as e:
-            logger.error(f"Speech detection failed", error=str(e))
+        except Exception:
+            logger.exception("Speech detection failed")
             return {'segments': [], 'features': [], 'embeddings': []}
     
-    async def _get_audio_info(self, file_path: str) -> Dict[str, Any]:
-        """Get basic audio information"""
-        try:
-            # Mock audio info
-            # In production, use librosa or similar to get actual info
+    def _get_audio_info(self, y: Optional[Any], sr: Optional[int]) -> Dict[str, Any]:
+        """Get basic audio information from the decoded samples"""
+        if y is None:
+            # Mock audio info when the file was not decoded
             return {
                 'duration': 0,
                 'sample_rate': 44100,
                 'channels': 2,
                 'format': 'unknown'
             }
-        except Exception as e:
-            logger.error(f"Failed to get audio info", error=str(e))
-            return {}
+        return {
+            'duration': y.shape[-1] / sr,
+            'sample_rate': sr,
+            'channels': 1 if y.ndim == 1 else y.shape[0],
+            'format': 'unknown'
+        }
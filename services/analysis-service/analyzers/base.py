@@ -3,26 +3,154 @@ Base Analyzer Class for DataFlux Analysis Service
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional
+from dataclasses import dataclass
+from collections import OrderedDict
+from typing import Collection, Dict, FrozenSet, List, Any, Optional
 import json
 import logging
+import os
+import threading
 
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+    
+    def dumps(obj: Any) -> str:
+        """Serialize analyzer output to JSON text (orjson, numpy-aware)"""
+        # Non-str keys (e.g. int EXIF/GPS tags) are stringified as json.dumps does
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS).decode()
+    
+    loads = orjson.loads
+except ImportError:
+    def dumps(obj: Any) -> str:
+        """Serialize analyzer output to JSON text"""
+        return json.dumps(obj)
+    
+    loads = json.loads
+
+# Stat results recorded by validate_file and reused by the info lookups of
+# the same analysis. validate_file always stats afresh, so a path that is
+# reused for a different download never serves an old size or mtime.
+_STAT_CACHE_SIZE = 2048
+_stat_cache: "OrderedDict[str, os.stat_result]" = OrderedDict()
+_stat_cache_lock = threading.Lock()
+
+def _stat_fresh(file_path: str) -> os.stat_result:
+    """os.stat that refreshes the cached entry; failed lookups raise and are not cached"""
+    stat = os.stat(file_path)
+    with _stat_cache_lock:
+        _stat_cache[file_path] = stat
+        _stat_cache.move_to_end(file_path)
+        if len(_stat_cache) > _STAT_CACHE_SIZE:
+            _stat_cache.popitem(last=False)
+    return stat
+
+def _stat_cached(file_path: str) -> os.stat_result:
+    """Stat recorded by the last validate_file for this path, else a fresh stat"""
+    with _stat_cache_lock:
+        stat = _stat_cache.get(file_path)
+    return stat if stat is not None else _stat_fresh(file_path)
+
+def clear_stat_cache():
+    """Drop recorded stat results"""
+    with _stat_cache_lock:
+        _stat_cache.clear()
+
+# Fixed-shape result records. __slots__ is declared by hand (rather than
+# dataclass(slots=True)) so the service keeps running on Python 3.9.
+@dataclass
+class Feature:
+    """Extracted feature record"""
+    __slots__ = ('type', 'domain', 'confidence', 'data', 'metadata')
+    type: str
+    domain: str
+    confidence: float
+    data: Dict[str, Any]
+    metadata: Dict[str, Any]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'type': self.type,
+            'domain': self.domain,
+            'confidence': self.confidence,
+            'data': self.data,
+            'metadata': self.metadata
+        }
+
+@dataclass
+class Segment:
+    """Detected segment record"""
+    __slots__ = ('type', 'start_time', 'end_time', 'confidence', 'metadata')
+    type: str
+    start_time: float
+    end_time: float
+    confidence: float
+    metadata: Dict[str, Any]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'type': self.type,
+            'start_time': self.start_time,
+            'end_time': self.end_time,
+            'confidence': self.confidence,
+            'metadata': self.metadata
+        }
+
+@dataclass
+class Embedding:
+    """Vector embedding record"""
+    __slots__ = ('type', 'model', 'vector', 'metadata')
+    type: str
+    model: str
+    vector: List[float]
+    metadata: Dict[str, Any]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'type': self.type,
+            'model': self.model,
+            'vector': self.vector,
+            'metadata': self.metadata
+        }
+
+_RECORD_TYPES = (Feature, Segment, Embedding)
+
+def _to_dicts(items: List[Any]) -> List[Dict[str, Any]]:
+    """Convert result records to plain dicts at the result boundary"""
+    return [item.to_dict() if isinstance(item, _RECORD_TYPES) else item for item in items]
+
 class BaseAnalyzer(ABC):
     """Base class for all media analyzers"""
     
+    # Subclasses that add no instance attributes can declare __slots__ = ()
+    # to drop the per-instance __dict__ entirely
+    __slots__ = ('name', 'supported_formats', 'model', 'device',
+                 '_success_suffix', '_error_suffix')
+    
+    # JSON serializer for subclasses (orjson when installed)
+    _dumps = staticmethod(dumps)
+    
+    # Immutable MIME type set; subclasses override at class level
+    SUPPORTED_FORMATS: FrozenSet[str] = frozenset()
+    
     def __init__(self):
         self.name = self.__class__.__name__
-        self.supported_formats = []
+        self.supported_formats = self.SUPPORTED_FORMATS
         self.model = None
         self.device = "cpu"  # Default to CPU, can be overridden
+        self._success_suffix = {'analyzer': self.name, 'status': 'success'}
+        self._error_suffix = {'analyzer': self.name, 'status': 'failed'}
     
     @abstractmethod
-    def get_supported_formats(self) -> List[str]:
-        """Return list of supported MIME types"""
+    def get_supported_formats(self) -> Collection[str]:
+        """Return the supported MIME types"""
         pass
     
+    def supports(self, mime_type: str) -> bool:
+        """Check whether the analyzer handles the given MIME type"""
+        return mime_type in self.get_supported_formats()
+    
     @abstractmethod
     async def analyze(self, file_path: str, asset_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -64,13 +192,14 @@ class BaseAnalyzer(ABC):
     
     def validate_file(self, file_path: str) -> bool:
         """Validate that the file can be processed"""
-        import os
-        return os.path.exists(file_path) and os.path.getsize(file_path) > 0
+        try:
+            return _stat_fresh(file_path).st_size > 0
+        except OSError:
+            return False
     
     def get_file_info(self, file_path: str) -> Dict[str, Any]:
         """Get basic file information"""
-        import os
-        stat = os.stat(file_path)
+        stat = _stat_cached(file_path)
         return {
             'size': stat.st_size,
             'modified': stat.st_mtime,
@@ -79,35 +208,43 @@ class BaseAnalyzer(ABC):
     
     def log_analysis_start(self, file_path: str, asset_data: Dict[str, Any]):
         """Log analysis start"""
-        logger.info(f"Starting {self.name} analysis for {file_path}")
+        logger.info("Starting %s analysis for %s", self.name, file_path)
     
     def log_analysis_end(self, file_path: str, results: Dict[str, Any]):
         """Log analysis completion"""
-        logger.info(f"Completed {self.name} analysis for {file_path}: {len(results.get('segments', []))} segments, {len(results.get('features', []))} features, {len(results.get('embeddings', []))} embeddings")
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        logger.info(
+            "Completed %s analysis for %s: %d segments, %d features, %d embeddings",
+            self.name, file_path,
+            len(results.get('segments', ())),
+            len(results.get('features', ())),
+            len(results.get('embeddings', ()))
+        )
     
     def create_error_result(self, error: str) -> Dict[str, Any]:
         """Create error result structure"""
+        metadata = {'error': error}
+        metadata.update(self._error_suffix)
         return {
             'segments': [],
             'features': [],
             'embeddings': [],
-            'metadata': {
-                'error': error,
-                'analyzer': self.name,
-                'status': 'failed'
-            }
+            'metadata': metadata
         }
     
-    def create_success_result(self, segments: List[Dict], features: List[Dict], 
-                            embeddings: List[Dict], metadata: Dict[str, Any]) -> Dict[str, Any]:
-        """Create success result structure"""
+    def create_success_result(self, segments: List[Any], features: List[Any], 
+                            embeddings: List[Any], metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Create success result structure
+        
+        Segments, features and embeddings may be plain dicts or
+        Segment/Feature/Embedding records; records are converted to dicts here.
+        The caller's metadata dict is copied, never modified.
+        """
         return {
-            'segments': segments,
-            'features': features,
-            'embeddings': embeddings,
-            'metadata': {
-                **metadata,
-                'analyzer': self.name,
-                'status': 'success'
-            }
+            'segments': _to_dicts(segments),
+            'features': _to_dicts(features),
+            'embeddings': _to_dicts(embeddings),
+            'metadata': {**metadata, **self._success_suffix}
         }
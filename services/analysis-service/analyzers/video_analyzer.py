@@ -32,7 +32,7 @@ class VideoAnalyzer(BaseAnalyzer):
         self.log_analysis_start(file_path, asset_data)
         
         try:
-            if not self.validate_file(file_path):
+            if not await asyncio.to_thread(self.validate_file, file_path):
                 return self.create_error_result("Invalid file")
             
             # Run analysis tasks in parallel
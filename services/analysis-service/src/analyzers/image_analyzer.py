@@ -22,6 +22,7 @@ class ImageAnalyzer:
     
     def __init__(self):
         self.yolo_model = None
+        self._rng = np.random.default_rng()
         self._initialize_models()
     
     def _initialize_models(self):
@@ -221,7 +222,7 @@ class ImageAnalyzer:
             
             # Sample für Performance
             if len(pixels) > 10000:
-                sample_indices = np.random.choice(len(pixels), 10000, replace=False)
+                sample_indices = self._rng.choice(len(pixels), 10000, replace=False)
                 sample_pixels = pixels[sample_indices]
             else:
                 sample_pixels = pixels
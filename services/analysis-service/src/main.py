@@ -28,7 +28,7 @@ import sys
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 
-from analyzers.base import BaseAnalyzer
+from analyzers.base import BaseAnalyzer, dumps, loads
 from analyzers.video_analyzer import VideoAnalyzer
 from analyzers.image_analyzer import ImageAnalyzer
 from analyzers.audio_analyzer import AudioAnalyzer
@@ -141,6 +141,8 @@ class AnalysisService:
         if self.http_client:
             await self.http_client.aclose()
         
+        ImageAnalyzer.close_shared()
+        
         logger.info("Analysis service stopped")
     
     async def _init_connections(self):
@@ -180,7 +182,7 @@ class AnalysisService:
                 group_id='analysis-service',
                 auto_offset_reset='latest',
                 enable_auto_commit=True,
-                value_deserializer=lambda m: json.loads(m.decode('utf-8'))
+                value_deserializer=loads
             )
             
             await self.kafka_consumer.start()
@@ -330,7 +332,7 @@ class AnalysisService:
                         ) VALUES ($1, $2, $3, $4, $5, $6, $7)
                     """, segment_id, asset_id, segment['type'], 
                     segment.get('start_time', 0), segment.get('end_time', 0),
-                    segment.get('confidence', 0.0), json.dumps(segment.get('metadata', {})))
+                    segment.get('confidence', 0.0), dumps(segment.get('metadata', {})))
                 
                 # Store features
                 for feature in results.get('features', []):
@@ -342,7 +344,7 @@ class AnalysisService:
                         ) VALUES ($1, $2, $3, $4, $5, $6, $7)
                     """, feature_id, feature.get('segment_id'), feature['type'],
                     feature.get('domain', 'general'), feature.get('confidence', 0.0),
-                    json.dumps(feature.get('data', {})), json.dumps(feature.get('metadata', {})))
+                    dumps(feature.get('data', {})), dumps(feature.get('metadata', {})))
                 
                 # Store embeddings
                 for embedding in results.get('embeddings', []):
@@ -353,8 +355,8 @@ class AnalysisService:
                             embedding_vector, dimensions, metadata
                         ) VALUES ($1, $2, $3, $4, $5, $6, $7)
                     """, embedding_id, asset_id, embedding['type'],
-                    embedding.get('model', 'unknown'), json.dumps(embedding['vector']),
-                    len(embedding['vector']), json.dumps(embedding.get('metadata', {})))
+                    embedding.get('model', 'unknown'), dumps(embedding['vector']),
+                    len(embedding['vector']), dumps(embedding.get('metadata', {})))
                 
                 logger.info("Analysis results stored", asset_id=asset_id, 
                           segments=len(results.get('segments', [])),
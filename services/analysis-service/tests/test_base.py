@@ -0,0 +1,155 @@
+"""
+DataFlux Analysis Service - Base Analyzer Unit Tests
+"""
+
+import pytest
+import json
+from unittest.mock import patch
+
+import numpy as np
+
+# Import the service components
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from analyzers import base
+from analyzers.base import BaseAnalyzer, dumps, loads
+
+class TestDumps:
+    """Test cases for the shared JSON serializer"""
+    
+    @pytest.fixture
+    def result(self):
+        """Analyzer result with numpy values and non-str keys"""
+        return {
+            'features': [{
+                'type': 'exif_comprehensive',
+                'data': {
+                    'gps': {1: 'N', 2: [52.0, 31.0, 12.5], 29: '2024:01:01'},
+                    'brightness': np.float32(0.5),
+                    'noise': np.float64(1.25),
+                    'pixels': np.int64(1024),
+                    'histogram': np.arange(4, dtype=np.uint32),
+                    'has_faces': np.bool_(False)
+                },
+                'metadata': {'analyzer': 'exif'}
+            }]
+        }
+    
+    def test_round_trip(self, result):
+        """Numpy values become plain JSON values and int keys become strings"""
+        data = loads(dumps(result))['features'][0]['data']
+        assert data['gps'] == {'1': 'N', '2': [52.0, 31.0, 12.5], '29': '2024:01:01'}
+        assert data['brightness'] == 0.5
+        assert data['noise'] == 1.25
+        assert data['pixels'] == 1024
+        assert data['histogram'] == [0, 1, 2, 3]
+        assert data['has_faces'] is False
+    
+    def test_matches_stdlib_for_plain_values(self):
+        """Plain results decode to the same value as json.dumps output"""
+        plain = {'gps': {1: 'N', 2: 3.5}, 'tags': ['a', 'b'], 'none': None}
+        assert loads(dumps(plain)) == json.loads(json.dumps(plain))
+    
+    def test_returns_text(self, result):
+        """The serializer returns str, as asyncpg JSON columns expect"""
+        assert isinstance(dumps(result), str)
+
+class StubAnalyzer(BaseAnalyzer):
+    """Minimal concrete analyzer"""
+    
+    __slots__ = ()
+    
+    async def analyze(self, file_path, asset_data):
+        return self.create_error_result("not implemented")
+    
+    def get_supported_formats(self):
+        return frozenset()
+
+class TestResults:
+    """Test cases for the result builders"""
+    
+    def test_success_result_leaves_metadata_untouched(self):
+        """The caller's metadata dict is not modified"""
+        analyzer = StubAnalyzer()
+        metadata = {'document_info': {'size': 1}}
+        result = analyzer.create_success_result([], [], [], metadata)
+        
+        assert metadata == {'document_info': {'size': 1}}
+        assert result['metadata'] == {
+            'document_info': {'size': 1},
+            'analyzer': 'StubAnalyzer',
+            'status': 'success'
+        }
+    
+    def test_error_result(self):
+        """Error results carry the message and a failed status"""
+        result = StubAnalyzer().create_error_result("boom")
+        assert result['metadata'] == {'error': 'boom', 'analyzer': 'StubAnalyzer', 'status': 'failed'}
+        assert result['features'] == []
+
+class TestStatCache:
+    """Test cases for the stat cache shared by validate_file and the info lookups"""
+    
+    @pytest.fixture(autouse=True)
+    def empty_cache(self):
+        """Start and end every test with an empty cache"""
+        base.clear_stat_cache()
+        yield
+        base.clear_stat_cache()
+    
+    @pytest.fixture
+    def analyzer(self):
+        """Create analyzer"""
+        return StubAnalyzer()
+    
+    def test_info_reuses_validated_stat(self, analyzer, tmp_path):
+        """get_file_info serves the stat recorded by validate_file"""
+        path = tmp_path / 'asset.bin'
+        path.write_bytes(b'12345')
+        assert analyzer.validate_file(str(path))
+        
+        with patch('analyzers.base.os.stat', side_effect=AssertionError("stat called")):
+            info = analyzer.get_file_info(str(path))
+        assert info['size'] == 5
+    
+    def test_validate_file_refreshes_stale_entries(self, analyzer, tmp_path):
+        """A rewritten or deleted file is never judged by an old stat"""
+        path = tmp_path / 'asset.bin'
+        path.write_bytes(b'')
+        assert not analyzer.validate_file(str(path))
+        
+        path.write_bytes(b'12345678')
+        assert analyzer.validate_file(str(path))
+        assert analyzer.get_file_info(str(path))['size'] == 8
+        
+        path.unlink()
+        assert not analyzer.validate_file(str(path))
+    
+    def test_uncached_lookup_stats_the_file(self, analyzer, tmp_path):
+        """Paths that were never validated fall back to a fresh stat"""
+        path = tmp_path / 'asset.bin'
+        path.write_bytes(b'123')
+        assert analyzer.get_file_info(str(path))['size'] == 3
+    
+    def test_cache_is_bounded(self, analyzer, tmp_path):
+        """The least recently recorded paths are evicted first"""
+        paths = []
+        for i in range(4):
+            path = tmp_path / f'asset-{i}.bin'
+            path.write_bytes(b'x')
+            paths.append(str(path))
+        
+        with patch.object(base, '_STAT_CACHE_SIZE', 2):
+            for path in paths:
+                analyzer.validate_file(path)
+        assert list(base._stat_cache) == paths[2:]
+    
+    def test_missing_file_is_not_cached(self, analyzer, tmp_path):
+        """Failed stats raise through and leave no entry"""
+        missing = str(tmp_path / 'missing.bin')
+        assert not analyzer.validate_file(missing)
+        assert missing not in base._stat_cache
+        with pytest.raises(OSError):
+            base._stat_cached(missing)
@@ -0,0 +1,128 @@
+"""
+DataFlux Analysis Service - Document Analyzer Unit Tests
+"""
+
+import pytest
+import asyncio
+import os
+import tempfile
+from unittest.mock import patch
+
+import numpy as np
+
+# Import the service components
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from analyzers.document_analyzer import (
+    DocumentAnalyzer, _preview_end, _token_offsets, _utf8_length
+)
+
+class TestTokenOffsets:
+    """Test cases for the byte tokenizer"""
+    
+    @pytest.mark.parametrize("data", [
+        b"",
+        b"   \t\n",
+        b"word",
+        b"two words",
+        b"  leading and trailing  ",
+        b"tabs\tnew\nlines\r\nvertical\x0bform\x0cfeed",
+        "unicode wörds ünd ümlauts".encode(),
+    ])
+    def test_matches_bytes_split(self, data):
+        """Tokens are exactly what bytes.split() yields"""
+        starts, lengths = _token_offsets(data)
+        tokens = [data[s:s + n] for s, n in zip(starts.tolist(), lengths.tolist())]
+        assert tokens == data.split()
+    
+    def test_returns_uint32_arrays(self):
+        """Offsets and lengths are compact uint32 arrays"""
+        starts, lengths = _token_offsets(b"a bb ccc")
+        assert starts.dtype == np.uint32
+        assert lengths.dtype == np.uint32
+        assert starts.tolist() == [0, 2, 5]
+        assert lengths.tolist() == [1, 2, 3]
+    
+    def test_accepts_memoryview(self):
+        """A memoryview over the document is tokenized without copying"""
+        data = bytearray(b"one two three")
+        starts, _ = _token_offsets(memoryview(data))
+        assert starts.size == 3
+
+class TestPreview:
+    """Test cases for the text preview helpers"""
+    
+    def test_preview_ends_on_whole_token(self):
+        """The preview stops after the last token that fits"""
+        data = b"alpha beta gamma"
+        starts, lengths = _token_offsets(data)
+        assert _preview_end(starts, lengths, 12) == len(b"alpha beta")
+        assert _preview_end(starts, lengths, 100) == len(data)
+    
+    def test_preview_cuts_oversized_token(self):
+        """A first token longer than the limit is cut at the limit"""
+        starts, lengths = _token_offsets(b"x" * 50)
+        assert _preview_end(starts, lengths, 10) == 10
+    
+    def test_utf8_length_counts_characters(self):
+        """Multi-byte characters count once"""
+        text = "naïve café ✓"
+        assert _utf8_length(memoryview(text.encode())) == len(text)
+
+class TestDocumentAnalyzer:
+    """Test cases for DocumentAnalyzer"""
+    
+    @pytest.fixture
+    def analyzer(self):
+        """Create analyzer"""
+        return DocumentAnalyzer()
+    
+    @pytest.fixture
+    def text_file(self):
+        """Create a sample text file"""
+        with tempfile.NamedTemporaryFile(delete=False, suffix='.txt') as f:
+            f.write("Sample  text\nfor the\tDataFlux analyzer – ünïcode\n".encode())
+            f.flush()
+            yield f.name
+        os.unlink(f.name)
+    
+    def test_text_document_is_counted_from_file(self, analyzer, text_file):
+        """Plain-text word counts come from the file contents"""
+        result = asyncio.run(analyzer.analyze(text_file, {'mime_type': 'text/plain'}))
+        
+        data = result['features'][0]['data']
+        content = Path(text_file).read_bytes()
+        assert data['word_count'] == len(content.split())
+        assert data['text_length'] == len(content.decode())
+        assert 'avg_word_length' not in data
+        assert result['segments'][0]['metadata']['text'] == content.decode().rstrip()
+    
+    def test_empty_file_is_rejected(self, analyzer):
+        """Empty documents return an error result"""
+        with tempfile.NamedTemporaryFile(suffix='.txt') as f:
+            result = asyncio.run(analyzer.analyze(f.name, {'mime_type': 'text/plain'}))
+        assert result['metadata']['status'] == 'failed'
+    
+    @pytest.mark.parametrize("mime_type", ['application/json', 'application/msword'])
+    def test_file_is_not_mapped_without_a_reader(self, analyzer, text_file, mime_type):
+        """Pipelines whose stages ignore content never map the file"""
+        with patch('analyzers.document_analyzer._mmap_file', side_effect=AssertionError("mapped")):
+            result = asyncio.run(analyzer.analyze(text_file, {'mime_type': mime_type}))
+        assert result['metadata']['status'] == 'success'
+    
+    def test_pdf_page_count_is_read_from_file(self, analyzer):
+        """PDF metadata reads the page tree from the mapped file"""
+        pdf = (b"%PDF-1.4\n1 0 obj <</Type /Pages /Kids [2 0 R 3 0 R] /Count 2>> endobj\n"
+               b"2 0 obj <</Type /Page /Parent 1 0 R>> endobj\n"
+               b"3 0 obj <</Type/Page /Parent 1 0 R>> endobj\n%%EOF\n")
+        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as f:
+            f.write(pdf)
+        try:
+            result = asyncio.run(analyzer.analyze(f.name, {'mime_type': 'application/pdf'}))
+        finally:
+            os.unlink(f.name)
+        
+        metadata = next(feature for feature in result['features'] if feature['type'] == 'document_metadata')
+        assert metadata['data']['page_count'] == 2
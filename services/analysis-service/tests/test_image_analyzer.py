@@ -0,0 +1,302 @@
+"""
+DataFlux Analysis Service - Image Analyzer Unit Tests
+"""
+
+import pytest
+import asyncio
+import shutil
+import time
+from contextlib import nullcontext
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import cv2
+import numpy as np
+
+# Import the service components
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from analyzers import image_analyzer
+
+class StubYOLO:
+    """Stand-in for ultralytics.YOLO that records how it is used"""
+    
+    # Non-zero makes .engine models behave like a static-batch export
+    static_batch = 0
+    
+    def __init__(self, path, task=None):
+        self.path = path
+        self.task = task
+        self.calls = []
+        self.overrides = {}
+        self.fused = False
+        self.device = 'cpu'
+    
+    def __call__(self, images):
+        if self.path.endswith('.engine') and self.static_batch and len(images) != self.static_batch:
+            raise RuntimeError(f"engine expects a batch of {self.static_batch}")
+        self.calls.append(len(images))
+        return [None] * len(images)
+    
+    def fuse(self):
+        self.fused = True
+    
+    def to(self, device):
+        self.device = device
+
+def _stub_torch(cuda: bool) -> SimpleNamespace:
+    """Minimal torch namespace for the loader"""
+    return SimpleNamespace(
+        backends=SimpleNamespace(cudnn=SimpleNamespace(benchmark=False)),
+        cuda=SimpleNamespace(
+            is_available=lambda: cuda,
+            set_per_process_memory_fraction=Mock()
+        ),
+        inference_mode=nullcontext
+    )
+
+class TestLoadYolo:
+    """Test cases for _load_yolo"""
+    
+    @pytest.fixture
+    def engine_path(self, tmp_path):
+        """Create a placeholder engine file"""
+        path = tmp_path / 'yolov8n.engine'
+        path.write_bytes(b'engine')
+        return str(path)
+    
+    def _load(self, engine_path, cuda=True):
+        with patch.object(image_analyzer, 'torch', _stub_torch(cuda)), \
+                patch.object(image_analyzer, 'YOLO', StubYOLO, create=True), \
+                patch.object(image_analyzer, 'YOLO_ENGINE_PATH', engine_path):
+            return image_analyzer._load_yolo()
+    
+    def test_engine_is_loaded_and_warmed_up(self, engine_path):
+        """A dynamic engine is used and warmed up with a single image"""
+        model = self._load(engine_path)
+        assert model.path == engine_path
+        assert model.task == 'detect'
+        assert model.calls == [1]
+    
+    def test_static_engine_falls_back_to_pt(self, engine_path):
+        """An engine rejecting the warm-up batch does not disable YOLO"""
+        with patch.object(StubYOLO, 'static_batch', 16):
+            model = self._load(engine_path)
+        assert model.path == 'yolov8n.pt'
+        assert model.fused
+        assert model.device == 'cuda'
+        assert model.overrides['half'] is True
+    
+    def test_pt_model_without_gpu(self, engine_path):
+        """Without CUDA the fused .pt model runs on the CPU in full precision"""
+        model = self._load(engine_path, cuda=False)
+        assert model.path == 'yolov8n.pt'
+        assert model.fused
+        assert model.device == 'cpu'
+        assert 'half' not in model.overrides
+
+class TestConfigureTorch:
+    """Test cases for _configure_torch"""
+    
+    def test_memory_fraction_is_off_by_default(self):
+        """The GPU memory share is left uncapped unless configured"""
+        torch = _stub_torch(cuda=True)
+        with patch.object(image_analyzer, 'torch', torch), \
+                patch.object(image_analyzer, 'TORCH_CUDA_MEMORY_FRACTION', None):
+            image_analyzer._configure_torch()
+        torch.cuda.set_per_process_memory_fraction.assert_not_called()
+        assert torch.backends.cudnn.benchmark is True
+    
+    def test_memory_fraction_from_env(self):
+        """TORCH_CUDA_MEMORY_FRACTION caps the process when set"""
+        torch = _stub_torch(cuda=True)
+        with patch.object(image_analyzer, 'torch', torch), \
+                patch.object(image_analyzer, 'TORCH_CUDA_MEMORY_FRACTION', '0.7'):
+            image_analyzer._configure_torch()
+        torch.cuda.set_per_process_memory_fraction.assert_called_once_with(0.7)
+
+def _recording_infer(delay: float = 0.05):
+    """Stub for _yolo_infer that records batch sizes and echoes its inputs"""
+    batches = []
+    
+    def infer(model, images):
+        batches.append(len(images))
+        time.sleep(delay)
+        return [f"result-{image}" for image in images]
+    
+    return infer, batches
+
+class TestYoloBatcher:
+    """Test cases for _YoloBatcher"""
+    
+    @pytest.fixture(autouse=True)
+    def no_shared_batcher(self):
+        """Every test starts without a process-wide batcher"""
+        image_analyzer.ImageAnalyzer.close_shared()
+        yield
+        image_analyzer.ImageAnalyzer.close_shared()
+    
+    def test_concurrent_requests_share_a_batch(self):
+        """Requests queued behind a running batch go out together, in order"""
+        infer, batches = _recording_infer()
+        batcher = image_analyzer._YoloBatcher(model=object())
+        
+        async def run():
+            first = asyncio.ensure_future(batcher.predict(0))
+            await asyncio.sleep(0.01)
+            rest = await asyncio.gather(*[batcher.predict(i) for i in range(1, 6)])
+            return [await first] + rest
+        
+        with patch.object(image_analyzer, '_yolo_infer', infer):
+            results = asyncio.run(run())
+        assert results == [f"result-{i}" for i in range(6)]
+        assert batches == [1, 5]
+    
+    def test_batches_are_capped(self):
+        """No batch exceeds max_batch"""
+        infer, batches = _recording_infer(delay=0)
+        batcher = image_analyzer._YoloBatcher(model=object(), max_batch=2)
+        
+        async def run():
+            return await asyncio.gather(*[batcher.predict(i) for i in range(5)])
+        
+        with patch.object(image_analyzer, '_yolo_infer', infer):
+            results = asyncio.run(run())
+        assert results == [f"result-{i}" for i in range(5)]
+        assert batches == [2, 2, 1]
+    
+    def test_inference_error_reaches_every_request(self):
+        """A failed batch fails each of its requests and the worker keeps going"""
+        calls = []
+        
+        def infer(model, images):
+            calls.append(len(images))
+            if len(calls) == 1:
+                raise RuntimeError("CUDA out of memory")
+            return list(images)
+        
+        batcher = image_analyzer._YoloBatcher(model=object())
+        
+        async def run():
+            failed = await asyncio.gather(*[batcher.predict(i) for i in range(3)], return_exceptions=True)
+            return failed, await batcher.predict(7)
+        
+        with patch.object(image_analyzer, '_yolo_infer', infer):
+            failed, after = asyncio.run(run())
+        assert all(isinstance(e, RuntimeError) for e in failed)
+        assert after == 7
+    
+    def test_close_cancels_worker_and_requests(self):
+        """close() cancels the worker and every request still waiting"""
+        infer, _ = _recording_infer(delay=0.2)
+        batcher = image_analyzer._YoloBatcher(model=object())
+        
+        async def run():
+            running = asyncio.ensure_future(batcher.predict(0))
+            await asyncio.sleep(0.05)
+            queued = asyncio.ensure_future(batcher.predict(1))
+            await asyncio.sleep(0)
+            worker = batcher._worker
+            batcher.close()
+            await asyncio.gather(running, queued, return_exceptions=True)
+            # Let the cancelled worker unwind
+            await asyncio.sleep(0)
+            return running, queued, worker
+        
+        with patch.object(image_analyzer, '_yolo_infer', infer):
+            running, queued, worker = asyncio.run(run())
+        assert running.cancelled()
+        assert queued.cancelled()
+        assert worker.cancelled()
+        assert batcher._worker is None
+    
+    def test_batcher_is_shared_across_instances(self):
+        """Every ImageAnalyzer uses the same batcher for the same model"""
+        model = object()
+        first, second = image_analyzer.ImageAnalyzer(), image_analyzer.ImageAnalyzer()
+        first.yolo_model = second.yolo_model = model
+        
+        batcher = first._get_yolo_batcher()
+        assert second._get_yolo_batcher() is batcher
+        
+        second.yolo_model = object()
+        assert second._get_yolo_batcher() is not batcher
+    
+    def test_shared_batcher_survives_event_loop_changes(self):
+        """The shared batcher rebinds to each new event loop"""
+        infer, batches = _recording_infer(delay=0)
+        analyzer = image_analyzer.ImageAnalyzer()
+        analyzer.yolo_model = object()
+        
+        with patch.object(image_analyzer, '_yolo_infer', infer):
+            assert asyncio.run(analyzer._get_yolo_batcher().predict(1)) == "result-1"
+            assert asyncio.run(analyzer._get_yolo_batcher().predict(2)) == "result-2"
+        assert batches == [1, 1]
+        
+        image_analyzer.ImageAnalyzer.close_shared()
+        assert image_analyzer.ImageAnalyzer._shared_yolo_batcher is None
+
+class TestFeatureCache:
+    """Test cases for the content-addressed feature cache"""
+    
+    @pytest.fixture(autouse=True)
+    def empty_cache(self):
+        """Start and end every test with an empty cache"""
+        image_analyzer._feature_cache.clear()
+        yield
+        image_analyzer._feature_cache.clear()
+    
+    @pytest.fixture
+    def image_file(self, tmp_path):
+        """Create a small noisy JPEG"""
+        rng = np.random.default_rng(0)
+        path = tmp_path / 'image.jpg'
+        cv2.imwrite(str(path), rng.integers(0, 256, (120, 160, 3), dtype=np.uint8))
+        return path
+    
+    def test_get_returns_a_copy(self):
+        """Callers cannot corrupt the cached blocks"""
+        image_analyzer._feature_cache_put('digest', [('Block', {'data': {'value': 1}})])
+        
+        first = image_analyzer._feature_cache_get('digest')
+        first[0][1]['data']['value'] = 2
+        assert image_analyzer._feature_cache_get('digest') == [('Block', {'data': {'value': 1}})]
+        assert image_analyzer._feature_cache_get('other') is None
+    
+    def test_failed_blocks_are_not_cached(self):
+        """Results containing an exception are retried on the next call"""
+        image_analyzer._feature_cache_put('digest', [('Block', {}), ('Broken', ValueError("bad"))])
+        assert image_analyzer._feature_cache_get('digest') is None
+    
+    def test_cache_is_bounded(self):
+        """The least recently used digests are evicted first"""
+        with patch.object(image_analyzer, '_FEATURE_CACHE_SIZE', 2):
+            for digest in ('a', 'b'):
+                image_analyzer._feature_cache_put(digest, [])
+            image_analyzer._feature_cache_get('a')
+            image_analyzer._feature_cache_put('c', [])
+        assert list(image_analyzer._feature_cache) == ['a', 'c']
+    
+    def test_digest_depends_on_content_only(self, image_file, tmp_path):
+        """Copies share a digest; any byte change produces a new one"""
+        copy = tmp_path / 'copy.jpg'
+        shutil.copyfile(image_file, copy)
+        assert image_analyzer._file_digest(str(copy)) == image_analyzer._file_digest(str(image_file))
+        
+        copy.write_bytes(copy.read_bytes() + b'\0')
+        assert image_analyzer._file_digest(str(copy)) != image_analyzer._file_digest(str(image_file))
+    
+    def test_analyze_hit_skips_decoding(self, image_file, tmp_path):
+        """Identical content at another path reuses the cached features without decoding"""
+        analyzer = image_analyzer.ImageAnalyzer()
+        first = asyncio.run(analyzer.analyze(str(image_file), {}))
+        
+        copy = tmp_path / 'copy.jpg'
+        shutil.copyfile(image_file, copy)
+        with patch.object(image_analyzer, '_decode_bgr', side_effect=AssertionError("decoded")):
+            second = asyncio.run(analyzer.analyze(str(copy), {}))
+        
+        assert second['features'] == first['features']
+        assert 'lighting_analysis' in [feature['type'] for feature in first['features']]